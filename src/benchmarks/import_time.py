@@ -0,0 +1,108 @@
+"""Guards the cold-start time of a headless fit.
+Every configuration is fit in a fresh interpreter (the way main.py runs) & the fastest of several
+runs is compared against a time budget. The script also fails if matplotlib gets imported, since
+nothing is plotted. Run it from the src directory: python3 benchmarks/import_time.py
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from time import perf_counter
+
+# Fits one configuration headlessly & reports whether matplotlib was imported along the way
+FIT_SCRIPT: str = """
+import json, sys
+from main import load_model_class
+model_class = load_model_class(sys.argv[1], sys.argv[2])
+model_class(sys.argv[3], 4).fit()
+print(json.dumps({"matplotlib_imported": "matplotlib" in sys.modules}))
+"""
+CONFIGURATIONS: tuple[tuple[str, str, str], ...] = (
+    ("gradient", "linear", "data/gradient/linear/univariate.csv"),
+    ("gradient", "quadratic", "data/gradient/quadratic/univariate.csv"),
+    ("normal", "linear", "data/normal/linear/trivariate.csv"),
+    ("normal", "quadratic", "data/normal/quadratic/trivariate.csv"),
+)
+
+
+def time_command(
+    command: list[str],
+    repeats: int,
+) -> tuple[float, str]:
+    """Runs a command several times & returns its fastest wall-clock time along with its output."""
+    best_time: float = float("inf")
+    output: str = ""
+    for _ in range(repeats):
+        start_time: float = perf_counter()
+        output = subprocess.run(
+            command, capture_output=True, text=True, check=True
+        ).stdout
+        best_time = min(best_time, perf_counter() - start_time)
+    return best_time, output
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.5,
+        help="Most seconds a headless fit may take from interpreter start (default: 0.5)",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Reference point: what importing matplotlib alone costs
+    baseline_time, _ = time_command([sys.executable, "-c", "pass"], args.repeats)
+    matplotlib_time, _ = time_command(
+        [sys.executable, "-c", "import matplotlib.pyplot"], args.repeats
+    )
+    results: list[dict] = []
+    for regression_method, regression_type, input_file_path in CONFIGURATIONS:
+        elapsed_time, output = time_command(
+            [
+                sys.executable,
+                "-c",
+                FIT_SCRIPT,
+                regression_method,
+                regression_type,
+                input_file_path,
+            ],
+            args.repeats,
+        )
+        results.append(
+            {
+                "regression_method": regression_method,
+                "regression_type": regression_type,
+                "input_file_path": input_file_path,
+                "seconds": round(elapsed_time, 4),
+                **json.loads(output),
+            }
+        )
+    print(
+        json.dumps(
+            {
+                "interpreter_seconds": round(baseline_time, 4),
+                "matplotlib_import_seconds": round(matplotlib_time, 4),
+                "budget_seconds": args.budget,
+                "results": results,
+            },
+            indent=4,
+        )
+    )
+    failures: list[dict] = [
+        result
+        for result in results
+        if result["seconds"] > args.budget or result["matplotlib_imported"]
+    ]
+    if failures:
+        sys.exit(f"{len(failures)} configuration(s) exceeded the cold-start budget.")
+
+
+if __name__ == "__main__":
+    main()
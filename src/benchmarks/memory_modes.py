@@ -0,0 +1,143 @@
+"""Compares the peak memory of the gradient descent memory modes on a wide polynomial expansion.
+The default path (a float64 design matrix) is measured against float32 storage, chunked gradient
+evaluation (which never builds the full design matrix) & both together. Every mode runs in a fresh
+process, so its peak RSS is its own. tracemalloc also reports the peak of the arrays NumPy allocated.
+Run it from the src directory: python3 benchmarks/memory_modes.py --size 500000
+"""
+
+import argparse
+import json
+from multiprocessing import get_context
+import os
+import resource
+import sys
+from time import perf_counter
+import tracemalloc
+
+# Make the models package importable no matter where the script is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_benchmarks import generate_dataset
+
+# Keyword arguments of GradDescReg for every memory mode ("float64" is the default path)
+MEMORY_MODES: dict[str, dict] = {
+    "float64": {},
+    "float32": {"dtype": "float32"},
+    "float64_chunked": {"chunk_size": None},
+    "float32_chunked": {"chunk_size": None, "dtype": "float32"},
+}
+
+
+def run_mode(
+    case: dict,
+) -> dict:
+    """Constructs & fits one model in one memory mode (meant to run in its own process)."""
+    from models.features import PolynomialFeatures
+    from models.grad_desc_reg import GradDescReg
+    from models.optimizers import Optimizer
+
+    options: dict = dict(MEMORY_MODES[case["mode"]])
+    if "chunk_size" in options:
+        options["chunk_size"] = case["chunk_size"]
+    tracemalloc.start()
+    start_time: float = perf_counter()
+    model = GradDescReg(
+        case["input_file_path"],
+        case["parameter_precision"],
+        optimizer=Optimizer(case["learning_rate"]),
+        standardize=True,
+        feature_spec=PolynomialFeatures(case["degree"], interactions=True),
+        precision_mode="display",
+        **options,
+    )
+    construct_time: float = perf_counter() - start_time
+    model.max_iterations = case["iterations"]
+    start_time = perf_counter()
+    model.fit()
+    fit_time: float = perf_counter() - start_time
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": case["mode"],
+        "p": len(model.theta),
+        "construct_seconds": round(construct_time, 3),
+        "seconds_per_iteration": round(fit_time / model.iterations, 6),
+        "traced_peak_mb": round(traced_peak / 1024**2, 2),
+        # ru_maxrss is reported in kilobytes on Linux (& in bytes on macOS)
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / (1024**2 if sys.platform == "darwin" else 1024),
+            2,
+        ),
+        "cost": float(model.cost),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500_000, help="Training examples")
+    parser.add_argument("--features", type=int, default=4, help="Input variables (n)")
+    parser.add_argument(
+        "--degree",
+        type=int,
+        default=3,
+        help="Degree of the expansion (with interactions)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--parameter-precision", type=int, default=4)
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--output", help="Writes the JSON report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    input_file_path: str = f"/tmp/memory_modes_m{args.size}_n{args.features}.bin"
+    generate_dataset(input_file_path, args.size, args.features, seed=0)
+    cases: list[dict] = [
+        {
+            "mode": mode,
+            "input_file_path": input_file_path,
+            "degree": args.degree,
+            "chunk_size": args.chunk_size,
+            "iterations": args.iterations,
+            "parameter_precision": args.parameter_precision,
+            "learning_rate": args.learning_rate,
+        }
+        for mode in MEMORY_MODES
+    ]
+    # A fresh (spawned) process per mode keeps peak RSS measurements independent
+    with get_context("spawn").Pool(processes=1, maxtasksperchild=1) as pool:
+        results: list[dict] = pool.map(run_mode, cases, chunksize=1)
+    os.remove(input_file_path)
+
+    baseline: dict = results[0]
+    report: dict = {
+        "m": args.size,
+        "n": args.features,
+        "degree": args.degree,
+        "chunk_size": args.chunk_size,
+        "results": results,
+        # How much less memory every mode needs than the default path
+        "reductions": [
+            {
+                "mode": result["mode"],
+                "traced_peak": round(
+                    baseline["traced_peak_mb"] / result["traced_peak_mb"], 2
+                ),
+                "peak_rss": round(baseline["peak_rss_mb"] / result["peak_rss_mb"], 2),
+            }
+            for result in results[1:]
+        ],
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Compares the "training" & "display" precision modes of the gradient descent models.
+Every dataset is fit in both modes with the same optimizer & the fastest of several runs is reported,
+along with the number of iterations, the final cost & the R² of each fit. The cost of the old
+divergence check (scanning every hypothesis for inf & nan) is measured against checking the cost alone.
+Run it from the src directory: python3 benchmarks/precision_modes.py
+"""
+
+import argparse
+from glob import glob
+import json
+import os
+import sys
+from time import perf_counter
+import timeit
+
+import numpy as np
+from numpy import ndarray
+
+# Make the models package importable no matter where the script is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.grad_desc_reg import PRECISION_MODES
+from models.optimizers import Optimizer
+from run_benchmarks import MODEL_CLASSES, generate_dataset
+
+
+def fit_case(
+    model_name: str,
+    input_file_path: str,
+    precision_mode: str,
+    args: argparse.Namespace,
+) -> dict:
+    """Fits one model in one precision mode several times & returns its fastest run."""
+    from importlib import import_module
+
+    module_name, class_name = MODEL_CLASSES[model_name]
+    model_class: type = getattr(import_module(module_name), class_name)
+    best_time: float = float("inf")
+    for _ in range(args.repeats):
+        model = model_class(
+            input_file_path,
+            args.parameter_precision,
+            optimizer=Optimizer(args.learning_rate),
+            standardize=args.standardize,
+            precision_mode=precision_mode,
+        )
+        model.max_iterations = args.max_iterations
+        start_time: float = perf_counter()
+        model.fit()
+        best_time = min(best_time, perf_counter() - start_time)
+    return {
+        "model": model_name,
+        "input_file_path": input_file_path,
+        "precision_mode": precision_mode,
+        "m": model.m,
+        "seconds": round(best_time, 6),
+        "iterations": model.iterations,
+        "seconds_per_iteration": round(best_time / model.iterations, 9),
+        "cost": float(model.compute_cost_and_gradients()[0]),
+        "r_squared": round(float(model.score()), 6),
+    }
+
+
+def time_divergence_checks(
+    m: int,
+    repeats: int,
+) -> dict:
+    """Times scanning m hypotheses for inf & nan against checking one scalar cost."""
+    hypothesis: ndarray = np.random.default_rng(0).normal(size=m)
+    cost: float = np.vdot(hypothesis, hypothesis)
+    scan_time: float = min(
+        timeit.repeat(
+            lambda: np.any(np.isinf(hypothesis)) or np.any(np.isnan(hypothesis)),
+            number=100,
+            repeat=repeats,
+        )
+    )
+    scalar_time: float = min(
+        timeit.repeat(lambda: np.isfinite(cost), number=100, repeat=repeats)
+    )
+    return {
+        "m": m,
+        "full_scan_microseconds": round(scan_time / 100 * 1e6, 3),
+        "scalar_cost_microseconds": round(scalar_time / 100 * 1e6, 3),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "input_file_paths",
+        nargs="*",
+        help="Datasets to fit (defaults to every gradient descent dataset under data/)",
+    )
+    parser.add_argument(
+        "--synthetic-size",
+        type=int,
+        default=200_000,
+        help="Also fits a synthetic dataset with this many training examples (0 to skip)",
+    )
+    parser.add_argument(
+        "--models", nargs="+", default=["GradDescLinReg", "GradDescQuadReg"]
+    )
+    parser.add_argument(
+        "--standardize",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Train on standardized columns (--no-standardize needs a much smaller learning rate)",
+    )
+    parser.add_argument("--parameter-precision", type=int, default=4)
+    parser.add_argument("--learning-rate", type=float, default=0.3)
+    parser.add_argument("--max-iterations", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Writes the JSON report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    input_file_paths: list[str] = args.input_file_paths or sorted(
+        glob("data/gradient/**/*.csv", recursive=True)
+    )
+    synthetic_file_path: str = None
+    if args.synthetic_size:
+        synthetic_file_path = f"/tmp/precision_modes_m{args.synthetic_size}.bin"
+        generate_dataset(synthetic_file_path, args.synthetic_size, 2, seed=0)
+        input_file_paths.append(synthetic_file_path)
+
+    results: list[dict] = [
+        fit_case(model_name, input_file_path, precision_mode, args)
+        for input_file_path in input_file_paths
+        for model_name in args.models
+        for precision_mode in PRECISION_MODES
+    ]
+    if synthetic_file_path is not None:
+        os.remove(synthetic_file_path)
+
+    # Speedups of the "display" mode over the "training" mode, case by case
+    speedups: list[dict] = [
+        {
+            "model": training["model"],
+            "input_file_path": training["input_file_path"],
+            "speedup": round(training["seconds"] / display["seconds"], 2),
+            "iterations_saved": training["iterations"] - display["iterations"],
+            # Rounded weights can stop short of the optimum, so display mode may end lower
+            "cost_reduction": training["cost"] - display["cost"],
+        }
+        for training, display in zip(results[::2], results[1::2])
+    ]
+    report: dict = {
+        "results": results,
+        "speedups": speedups,
+        "divergence_checks": [
+            time_divergence_checks(m, args.repeats) for m in (1_000, 100_000, 1_000_000)
+        ],
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Times every stage (load, design matrix, fit, predict) of every model on synthetic datasets.
+Datasets of each requested size are generated in the same layout as data_generating_scripts
+(one variable per line) & every model runs in a fresh process, so its peak RSS is its own.
+Results are written as JSON, so runs can be compared over time.
+Run it from the src directory: python3 benchmarks/run_benchmarks.py --sizes 1000 100000
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+from multiprocessing import get_context
+import os
+import platform
+import resource
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+from numpy import ndarray
+
+# Make the models package importable no matter where the script is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.data_loader import create_binary
+
+# Module & class name of every benchmarked model
+MODEL_CLASSES: dict[str, tuple[str, str]] = {
+    "GradDescLinReg": ("models.grad_desc_lin_reg", "GradDescLinReg"),
+    "GradDescQuadReg": ("models.grad_desc_quad_reg", "GradDescQuadReg"),
+    "NormEqLinReg": ("models.norm_eq_lin_reg", "NormEqLinReg"),
+    "NormEqQuadReg": ("models.norm_eq_quad_reg", "NormEqQuadReg"),
+}
+GENERATION_CHUNK_SIZE: int = 1_000_000  # Training examples generated at a time
+
+
+def generate_chunk(
+    chunk_index: int,
+    chunk_size: int,
+    n: int,
+    seed: int,
+) -> ndarray:
+    """Returns an (n+1)x(chunk_size) block of synthetic data (the last row holds the labels).
+    Each chunk has its own seed, so any chunk can be regenerated on its own.
+    """
+    rng: np.random.Generator = np.random.default_rng([seed, chunk_index])
+    chunk: ndarray = np.empty((n + 1, chunk_size))
+    chunk[:-1] = rng.uniform(-10, 10, (n, chunk_size))
+    weights: ndarray = np.linspace(-2, 2, n)
+    # Mostly linear labels with a small quadratic term & some noise
+    chunk[-1] = (
+        1
+        + weights @ chunk[:-1]
+        + 0.05 * np.sum(chunk[:-1] ** 2, axis=0)
+        + rng.normal(0, 1, chunk_size)
+    )
+    return chunk
+
+
+def generate_dataset(
+    output_file_path: str,
+    m: int,
+    n: int,
+    seed: int,
+) -> None:
+    """Writes a synthetic dataset with m training examples & n input variables.
+    CSV files get one variable per line (like data_generating_scripts), .bin files use the binary format.
+    Data is generated in chunks, so datasets larger than memory can be written.
+    """
+    chunk_sizes: list[int] = [
+        min(GENERATION_CHUNK_SIZE, m - start)
+        for start in range(0, m, GENERATION_CHUNK_SIZE)
+    ]
+    if output_file_path.endswith(".bin"):
+        data: np.memmap = create_binary(output_file_path, (n + 1, m))
+        for chunk_index, chunk_size in enumerate(chunk_sizes):
+            start: int = chunk_index * GENERATION_CHUNK_SIZE
+            data[:, start : start + chunk_size] = generate_chunk(
+                chunk_index, chunk_size, n, seed
+            )
+        data.flush()
+        return
+    with open(output_file_path, "w") as output_file:
+        for i in range(n + 1):
+            # Each line holds a whole variable, so every chunk is regenerated once per line
+            for chunk_index, chunk_size in enumerate(chunk_sizes):
+                row: ndarray = generate_chunk(chunk_index, chunk_size, n, seed)[i]
+                if chunk_index > 0:
+                    output_file.write(" , ")
+                output_file.write(" , ".join("%.2f" % value for value in row))
+            output_file.write("\n")
+
+
+def run_case(
+    case: dict,
+) -> dict:
+    """Benchmarks one model on one dataset (meant to run in its own process)."""
+    from importlib import import_module
+
+    module_name, class_name = MODEL_CLASSES[case["model"]]
+    model_class: type = getattr(import_module(module_name), class_name)
+    timings: dict[str, float] = {}
+
+    class TimedModel(model_class):
+        """Records how long the constructor spends loading data & building the design matrix."""
+
+        def parse_input(self, *args, **kwargs) -> ndarray:
+            start_time: float = perf_counter()
+            data: ndarray = super().parse_input(*args, **kwargs)
+            timings["load"] = perf_counter() - start_time
+            return data
+
+        def construct_design_matrix(self, *args, **kwargs) -> ndarray:
+            start_time: float = perf_counter()
+            design_matrix: ndarray = super().construct_design_matrix(*args, **kwargs)
+            timings.setdefault("design_matrix", perf_counter() - start_time)
+            return design_matrix
+
+    if class_name.startswith("GradDesc"):
+        from models.optimizers import Optimizer
+
+        model = TimedModel(
+            case["input_file_path"],
+            case["parameter_precision"],
+            optimizer=Optimizer(case["learning_rate"]),
+            standardize=True,
+        )
+        model.max_iterations = case["max_iterations"]
+    else:
+        model = TimedModel(case["input_file_path"], case["parameter_precision"])
+
+    start_time: float = perf_counter()
+    model.fit()
+    timings["fit"] = perf_counter() - start_time
+
+    start_time = perf_counter()
+    model.predict(model.experimental_data[:-1])
+    timings["predict"] = perf_counter() - start_time
+
+    return {
+        "model": case["model"],
+        "m": case["m"],
+        "n": case["n"],
+        "format": case["format"],
+        "seconds": {stage: round(seconds, 6) for stage, seconds in timings.items()},
+        "rows_per_second": {
+            stage: round(case["m"] / seconds) if seconds > 0 else None
+            for stage, seconds in timings.items()
+        },
+        # ru_maxrss is reported in kilobytes on Linux (& in bytes on macOS)
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / (1024**2 if sys.platform == "darwin" else 1024),
+            2,
+        ),
+        "iterations": getattr(model, "iterations", None),
+        "r_squared": round(float(model.score()), 6),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Numbers of training examples (m) to benchmark (10^3 to 10^8)",
+    )
+    parser.add_argument("--features", type=int, default=3, help="Input variables (n)")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_CLASSES))
+    parser.add_argument(
+        "--format",
+        choices=("csv", "bin"),
+        default="csv",
+        help="Dataset file format (binary files avoid parsing very large CSV files)",
+    )
+    parser.add_argument("--parameter-precision", type=int, default=4)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--max-iterations", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--data-dir", help="Keeps the generated datasets in this directory"
+    )
+    parser.add_argument("--output", help="Writes the JSON report to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for model in args.models:
+        if model not in MODEL_CLASSES:
+            sys.exit(f"Unknown model '{model}'. Choose from {tuple(MODEL_CLASSES)}.")
+    data_dir: str = args.data_dir or tempfile.mkdtemp(prefix="benchmarks-")
+    os.makedirs(data_dir, exist_ok=True)
+
+    cases: list[dict] = []
+    dataset_file_paths: list[str] = []
+    for m in args.sizes:
+        input_file_path: str = os.path.join(
+            data_dir, f"synthetic_m{m}_n{args.features}.{args.format}"
+        )
+        generate_dataset(input_file_path, m, args.features, args.seed)
+        dataset_file_paths.append(input_file_path)
+        for model in args.models:
+            cases.append(
+                {
+                    "model": model,
+                    "m": m,
+                    "n": args.features,
+                    "format": args.format,
+                    "input_file_path": input_file_path,
+                    "parameter_precision": args.parameter_precision,
+                    "learning_rate": args.learning_rate,
+                    "max_iterations": args.max_iterations,
+                }
+            )
+
+    # A fresh (spawned) process per case keeps peak RSS measurements independent
+    with get_context("spawn").Pool(processes=1, maxtasksperchild=1) as pool:
+        results: list[dict] = pool.map(run_case, cases, chunksize=1)
+
+    if args.data_dir is None:
+        for input_file_path in dataset_file_paths:
+            os.remove(input_file_path)
+        os.rmdir(data_dir)
+
+    report: dict = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
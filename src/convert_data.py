@@ -0,0 +1,44 @@
+import argparse
+from glob import glob
+
+from models.data_loader import LAYOUTS, convert_csv
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Converts CSV datasets to memory-mappable binary dataset files.",
+    )
+    parser.add_argument(
+        "input_file_paths",
+        nargs="*",
+        help="CSV files to convert (defaults to every CSV file under data/)",
+    )
+    parser.add_argument("--layout", choices=LAYOUTS, default="variables")
+    parser.add_argument("--dtype", choices=("float64", "float32"), default="float64")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help='Training examples converted at a time ("samples" layout only)',
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    input_file_paths: list[str] = args.input_file_paths or sorted(
+        glob("data/**/*.csv", recursive=True)
+    )
+    for input_file_path in input_file_paths:
+        output_file_path: str = convert_csv(
+            input_file_path,
+            layout=args.layout,
+            dtype=args.dtype,
+            chunk_size=args.chunk_size,
+        )
+        print(f"{input_file_path} -> {output_file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Renders the training of a gradient descent model to a GIF or MP4 file without a display.
+The model is described by a configuration file (like main.py's config.json), fit while its weights
+are recorded & the frames are rendered in parallel on the Agg backend.
+Run it from the src directory: python3 export_animation.py training.gif
+"""
+
+import argparse
+import os
+from time import perf_counter
+
+from main import build_model, parse_config
+from models.animation import export_animation
+
+# Configurations of the animations shown in the README, keyed by their image file
+README_ANIMATIONS: dict[str, dict] = {
+    f"../images/gradient/{regression_type}/{variables}.gif": {
+        "regression_method": "gradient",
+        "regression_type": regression_type,
+        "input_file_path": f"data/gradient/{regression_type}/{variables}.csv",
+        "parameter_precision": 4,
+        "standardize": True,
+        "learning_rate": 0.05,
+    }
+    for regression_type in ("linear", "quadratic")
+    for variables in ("univariate", "bivariate", "trivariate")
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "output_file_path", nargs="?", help="GIF or MP4 file to write the animation to"
+    )
+    parser.add_argument("--config", default="config.json", help="Model configuration")
+    parser.add_argument(
+        "--readme-images",
+        action="store_true",
+        help="Regenerates every gradient descent animation of the README instead",
+    )
+    parser.add_argument("--frames", type=int, default=60, help="Most frames rendered")
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument(
+        "--workers", type=int, help="Rendering processes (one per CPU by default)"
+    )
+    parser.add_argument("--width", type=float, default=8, help="Width in inches")
+    parser.add_argument("--height", type=float, default=4, help="Height in inches")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument(
+        "--rotation",
+        type=float,
+        default=2.0,
+        help="Degrees 3D plots rotate by every frame",
+    )
+    args = parser.parse_args()
+    if args.output_file_path is None and not args.readme_images:
+        parser.error("an output file (or --readme-images) is required")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.readme_images:
+        animations: dict[str, dict] = README_ANIMATIONS
+    else:
+        animations: dict[str, dict] = {args.output_file_path: parse_config(args.config)}
+    for output_file_path, config in animations.items():
+        start_time: float = perf_counter()
+        model = build_model(config)
+        if not hasattr(model, "snapshots"):
+            raise SystemExit("Only gradient descent models can be animated.")
+        os.makedirs(os.path.dirname(output_file_path) or ".", exist_ok=True)
+        frames: int = export_animation(
+            model,
+            output_file_path,
+            args.frames,
+            args.fps,
+            args.workers,
+            (args.width, args.height),
+            args.dpi,
+            args.rotation,
+        )
+        print(
+            f"{frames} frames ({model.iterations} iterations) -> {output_file_path}"
+            f" in {perf_counter() - start_time:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
+from importlib import import_module
 import json
 
-from models.grad_desc_lin_reg import GradDescLinReg
-from models.grad_desc_quad_reg import GradDescQuadReg
+from models.features import PolynomialFeatures
+from models.regression_model import RegressionModel
 
-from models.norm_eq_lin_reg import NormEqLinReg
-from models.norm_eq_quad_reg import NormEqQuadReg
+# Module & class name of the model for each (regression method, regression type) pair.
+# Only the module of the configured model is imported (& only the helpers the configuration uses).
+MODEL_CLASSES: dict[tuple[str, str], tuple[str, str]] = {
+    ("gradient", "linear"): ("models.grad_desc_lin_reg", "GradDescLinReg"),
+    ("gradient", "quadratic"): ("models.grad_desc_quad_reg", "GradDescQuadReg"),
+    ("gradient", "polynomial"): ("models.grad_desc_reg", "GradDescReg"),
+    ("normal", "linear"): ("models.norm_eq_lin_reg", "NormEqLinReg"),
+    ("normal", "quadratic"): ("models.norm_eq_quad_reg", "NormEqQuadReg"),
+    ("normal", "polynomial"): ("models.norm_eq_reg", "NormEqReg"),
+}
 
 
 def parse_config(
@@ -15,28 +24,160 @@ def parse_config(
         return json.load(config_file)
 
 
-def main():
-    config: dict[str, int | str] = parse_config("config.json")
+def load_model_class(
+    regression_method: str,
+    regression_type: str,
+) -> type[RegressionModel]:
+    """Imports & returns the model class for the given regression method & type."""
+    if (regression_method, regression_type) not in MODEL_CLASSES:
+        error_message: str = """Invalid configuration file.
+        'regression_method' must be 'gradient', 'minibatch', 'sgd', or 'normal'.
+        'regression_type' must be 'linear', 'quadratic', or 'polynomial'.
+        """
+        raise ValueError(error_message)
+    module_name, class_name = MODEL_CLASSES[(regression_method, regression_type)]
+    return getattr(import_module(module_name), class_name)
+
+
+def build_model(
+    config: dict,
+) -> RegressionModel:
+    """Constructs the (unfitted) model described by a configuration dictionary."""
     regression_method: str = config["regression_method"]
     regression_type: str = config["regression_type"]
     input_file_path: str = config["input_file_path"]
     parameter_precision: int = config["parameter_precision"]
+    input_layout: str = config.get("input_layout", "variables")
+    chunk_size: int = config.get("chunk_size")
+    solver: str = config.get("solver", "auto")
+    seed: int = config.get("seed")
+    standardize: bool = config.get("standardize", False)
+    instrumentation_config: dict = config.get("instrumentation")
+    targets: int = config.get("targets", 1)
+    precision_mode: str = config.get("precision_mode", "training")
+    # Penalty on the weights: L2 (ridge) by default, L1 or elastic net with an l1_ratio
+    regularization: float = config.get("regularization", 0.0)
+    l1_ratio: float = config.get("l1_ratio", 0.0)
+    # Whether the last row (or column) of the dataset holds a weight for every training example
+    weighted: bool = config.get("sample_weights", False)
+    loss: str = config.get("loss", "squared")
+    # Linear & quadratic models have fixed features, polynomial ones are configurable
+    feature_spec: PolynomialFeatures = None
+    if regression_type == "polynomial":
+        feature_spec = PolynomialFeatures(
+            config.get("degree", 2), config.get("interactions", False)
+        )
+    # Number of training examples per step for each gradient descent method
+    batch_sizes: dict[str, int] = {
+        "gradient": None,
+        "minibatch": config.get("batch_size", 32),
+        "sgd": 1,
+    }
+
+    if regression_method not in batch_sizes:
+        model_class: type = load_model_class(regression_method, regression_type)
+        return model_class(
+            input_file_path,
+            parameter_precision,
+            input_layout,
+            chunk_size,
+            solver,
+            targets,
+            feature_spec,
+            regularization=regularization,
+            l1_ratio=l1_ratio,
+            weighted=weighted,
+            loss=loss,
+            huber_delta=config.get("huber_delta", 1.345),
+        )
+
+    if l1_ratio != 0:
+        raise ValueError(
+            "L1 & elastic net penalties are only fit by coordinate descent ('regression_method': 'normal')."
+        )
+    if loss != "squared":
+        raise ValueError(
+            "The Huber loss is only fit by IRLS ('regression_method': 'normal')."
+        )
+    from models.convergence import ConvergenceCriteria, LineSearch
+    from models.optimizers import Optimizer, make_optimizer
+
+    optimizer: Optimizer = make_optimizer(
+        config.get("optimizer", "gradient_descent"),
+        config.get("learning_rate", 10e-4),
+        config.get("learning_rate_schedule", "constant"),
+        config.get("optimizer_options"),
+        config.get("schedule_options"),
+    )
+    # Full-batch gradient descent can size its steps with a line search instead
+    line_search: LineSearch = None
+    if config.get("line_search") is not None:
+        line_search = LineSearch(
+            config["line_search"], config.get("learning_rate", 10e-4)
+        )
+    model_class: type = load_model_class("gradient", regression_type)
+    model: RegressionModel = model_class(
+        input_file_path,
+        parameter_precision,
+        input_layout,
+        batch_sizes[regression_method],
+        seed,
+        optimizer,
+        standardize,
+        targets,
+        feature_spec,
+        precision_mode,
+        line_search,
+        ConvergenceCriteria(**config.get("stopping", {})),
+        chunk_size,
+        config.get("dtype", "float64"),
+        regularization,
+        weighted,
+    )
+    model.max_iterations = config.get("max_iterations", model.max_iterations)
+    if instrumentation_config is not None:
+        from models.instrumentation import Instrumentation, print_progress
+
+        model.instrumentation = Instrumentation(
+            print_progress,
+            instrumentation_config.get("callback_every", 1000),
+            instrumentation_config.get("profile"),
+        )
+    return model
+
+
+def main():
+    config: dict[str, int | str] = parse_config("config.json")
+    # True plots the fitted model, "live" animates gradient descent models while they train
+    visualize: bool | str = config.get("visualize", True)
+    instrumentation_config: dict = config.get("instrumentation")
+    model_file_path: str = config.get("save_model")
 
     try:
-        if regression_method == "gradient" and regression_type == "linear":
-            GradDescLinReg(input_file_path, parameter_precision)
-        elif regression_method == "gradient" and regression_type == "quadratic":
-            GradDescQuadReg(input_file_path, parameter_precision)
-        elif regression_method == "normal" and regression_type == "linear":
-            NormEqLinReg(input_file_path, parameter_precision)
-        elif regression_method == "normal" and regression_type == "quadratic":
-            NormEqQuadReg(input_file_path, parameter_precision)
+        model: RegressionModel = build_model(config)
+        renderer: "LiveRenderer" = None
+        if visualize == "live" and hasattr(model, "snapshots"):
+            from models.live_plot import LiveRenderer
+
+            renderer = LiveRenderer(model, config.get("fps", 30))
+            renderer.run()
+        else:
+            model.fit()
+        if model_file_path is not None:
+            from models.artifacts import save_model
+
+            save_model(model, model_file_path)
+        if instrumentation_config is not None and hasattr(model, "instrumentation"):
+            if "output" in instrumentation_config:
+                model.instrumentation.export(instrumentation_config["output"])
+            else:
+                print(json.dumps(model.instrumentation.to_dict()["stages"], indent=4))
+        if renderer is not None:
+            renderer.show()
+        elif visualize:
+            model.visualize()
         else:
-            error_message: str = """Invalid configuration file.
-            'regression_method' must be either 'gradient' or 'normal'.
-            'regression_type' must be either 'linear' or 'quadratic'.
-            """
-            raise ValueError(error_message)
+            model.print_regression_equation()
     except KeyboardInterrupt:
         pass
 
@@ -0,0 +1,262 @@
+from multiprocessing import Pool
+import shutil
+import subprocess
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+from numpy import ndarray
+
+from .live_plot import (
+    GRID_POINTS,
+    SnapshotBuffer,
+    create_artists,
+    surface_corners,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+    from .grad_desc_reg import GradDescReg
+
+ANIMATION_FORMATS: tuple[str, ...] = ("gif", "mp4")
+# The scene & figure of a frame rendering worker (set up once per process by start_worker)
+WORKER_SCENE: dict = {}
+
+
+class SnapshotRecorder(SnapshotBuffer):
+    """Keeps every snapshot published during a fit, so the fit can be rendered afterwards.
+    Only references are kept (the optimizers never modify weights in place), so recording is cheap.
+    """
+
+    history: list[tuple[int, float, ndarray]] = None  # Snapshots of every pass
+
+    def publish(
+        self,
+        iteration: int,
+        cost: float,
+        theta: ndarray,
+    ) -> None:
+        super().publish(iteration, cost, theta)
+        self.history.append(self.snapshot)
+
+    def __init__(self) -> None:
+        self.history = []
+
+
+def record_fit(
+    model: "GradDescReg",
+) -> list[tuple[int, float, ndarray]]:
+    """Fits a gradient descent model & returns the (iteration, cost, weights) of every pass."""
+    recorder: SnapshotRecorder = SnapshotRecorder()
+    model.snapshots = recorder
+    try:
+        model.fit()
+    finally:
+        model.snapshots = None
+    return recorder.history
+
+
+def build_scene(
+    model: "GradDescReg",
+    history: list[tuple[int, float, ndarray]],
+    frames: int = 60,
+    figure_size: tuple[float, float] = (8, 4),
+    dpi: int = 100,
+    rotation: float = 2.0,
+) -> dict:
+    """Precomputes everything the frames of an animation show, for all frames at once.
+    The snapshots are spread evenly over the fit (the last frame shows the fitted weights), & the
+    curves, surfaces or residuals of every frame come from a single matrix product.
+    """
+    indices: ndarray = np.unique(
+        np.linspace(0, len(history) - 1, frames).round().astype(int)
+    )
+    # (F)x(p) weights of every frame in the original units
+    betas: ndarray = np.stack([model.descale(history[i][2]) for i in indices])
+    betas[-1] = model.beta
+    data: ndarray = np.asarray(model.experimental_data)
+    n: int = model.n
+    if n == 1:
+        inputs: ndarray = np.linspace(np.amin(data[0]), np.amax(data[0]), GRID_POINTS)
+        # (F)x(g) curves
+        values: ndarray = (
+            model.construct_design_matrix(inputs[np.newaxis]) @ betas.T
+        ).T
+    elif n == 2:
+        x1, x2 = np.meshgrid(
+            np.linspace(np.amin(data[0]), np.amax(data[0]), GRID_POINTS),
+            np.linspace(np.amin(data[1]), np.amax(data[1]), GRID_POINTS),
+        )
+        heights: ndarray = (
+            model.construct_design_matrix(np.stack([x1.ravel(), x2.ravel()])) @ betas.T
+        )
+        # (F)x((g-1)²)x(4) heights of the corners of every quad of every surface
+        values: ndarray = surface_corners(
+            heights.T.reshape(-1, GRID_POINTS, GRID_POINTS)
+        )
+    else:
+        # (F)x(m) residuals of every training example
+        values: ndarray = np.abs(
+            model.construct_design_matrix(data[:n]) @ betas.T - model.y[:, np.newaxis]
+        ).T
+    return {
+        "data": data,
+        "n": n,
+        "values": values,
+        "titles": [model.format_equation(beta, subscripts=True) for beta in betas],
+        "labels": [
+            f"Iteration {history[i][0]}: cost = {history[i][1]:.6g}" for i in indices
+        ],
+        "azimuths": [
+            (rotation * frame + 180) % 360 - 180 for frame in range(len(indices))
+        ],
+        "figure_size": figure_size,
+        "dpi": dpi,
+    }
+
+
+def start_worker(
+    scene: dict,
+) -> None:
+    """Creates the figure a worker renders its frames with (on the Agg backend, without pyplot)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig: Figure = Figure(figsize=scene["figure_size"], dpi=scene["dpi"])
+    FigureCanvasAgg(fig)
+    ax, artist, inputs = create_artists(fig, scene["data"], scene["n"])
+    if scene["n"] == 2:
+        # The corners of the grid are the same in every frame, only their heights change
+        x1, x2 = inputs.reshape(2, GRID_POINTS, GRID_POINTS)
+        scene["corners"] = np.stack([surface_corners(x1), surface_corners(x2)], axis=-1)
+    WORKER_SCENE.update(
+        scene,
+        fig=fig,
+        ax=ax,
+        artist=artist,
+        status=fig.text(0.98, 0.02, "", ha="right"),
+    )
+
+
+def render_frame(
+    frame: int,
+) -> ndarray:
+    """Renders one frame of the worker's scene & returns its (height)x(width)x(3) RGB pixels."""
+    scene: dict = WORKER_SCENE
+    values: ndarray = scene["values"][frame]
+    if scene["n"] == 1:
+        scene["artist"].set_ydata(values)
+    elif scene["n"] == 2:
+        scene["artist"].set_verts(
+            np.concatenate([scene["corners"], values[..., np.newaxis]], axis=-1)
+        )
+    else:
+        scene["artist"].set_array(values)
+    if scene["n"] > 1:
+        scene["ax"].view_init(elev=20, azim=scene["azimuths"][frame])
+    scene["ax"].set_title(scene["titles"][frame], fontsize=10)
+    scene["status"].set_text(scene["labels"][frame])
+    canvas = scene["fig"].canvas
+    canvas.draw()
+    return np.array(np.asarray(canvas.buffer_rgba())[..., :3])
+
+
+def render_gif_frame(
+    frame: int,
+) -> "Image.Image":
+    """Renders one frame & reduces it to a palette of 256 colors, which is most of the work of
+    encoding a GIF (done by the workers, so writing the file stays cheap).
+    """
+    from PIL import Image
+
+    return Image.fromarray(render_frame(frame)).quantize(
+        256, method=Image.Quantize.FASTOCTREE
+    )
+
+
+def write_gif(
+    images: list["Image.Image"],
+    output_file_path: str,
+    fps: float,
+) -> None:
+    images[0].save(
+        output_file_path,
+        save_all=True,
+        append_images=images[1:],
+        duration=round(1000 / fps),
+        loop=0,
+    )
+
+
+def write_mp4(
+    frames: list[ndarray],
+    output_file_path: str,
+    fps: float,
+) -> None:
+    """Pipes raw RGB frames through ffmpeg into an H.264 video."""
+    ffmpeg: str = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise ValueError("Exporting MP4 files requires ffmpeg (export a GIF instead).")
+    subprocess.run(
+        [
+            ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{frames[0].shape[1]}x{frames[0].shape[0]}",
+            "-r",
+            str(fps),
+            "-i",
+            "-",
+            # H.264 needs even dimensions
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            output_file_path,
+        ],
+        input=b"".join(frame.tobytes() for frame in frames),
+        check=True,
+    )
+
+
+def export_animation(
+    model: "GradDescReg",
+    output_file_path: str,
+    frames: int = 60,
+    fps: float = 10,
+    workers: int = None,
+    figure_size: tuple[float, float] = (8, 4),
+    dpi: int = 100,
+    rotation: float = 2.0,
+) -> int:
+    """Fits a gradient descent model without a display & writes its training as a GIF or MP4 file.
+    The weights of every pass are recorded during the fit, then the frames are rendered in parallel
+    by a pool of worker processes (each with its own figure). Returns the number of frames written.
+    """
+    file_format: str = output_file_path.rsplit(".", 1)[-1].lower()
+    if file_format not in ANIMATION_FORMATS:
+        raise ValueError(
+            f"The output file must be one of {ANIMATION_FORMATS}, got '{output_file_path}'."
+        )
+    if model.targets > 1 or model.n > 3 or model.experimental_data is None:
+        raise ValueError("Animations need a single target & at most 3 input variables.")
+    if frames < 1:
+        raise ValueError("'frames' must be a positive integer.")
+    history: list[tuple[int, float, ndarray]] = record_fit(model)
+    scene: dict = build_scene(model, history, frames, figure_size, dpi, rotation)
+    render: Callable[[int], object] = (
+        render_gif_frame if file_format == "gif" else render_frame
+    )
+    with Pool(workers, start_worker, (scene,)) as pool:
+        images: list = pool.map(render, range(len(scene["titles"])))
+    if file_format == "gif":
+        write_gif(images, output_file_path, fps)
+    else:
+        write_mp4(images, output_file_path, fps)
+    return len(images)
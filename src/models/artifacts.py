@@ -0,0 +1,169 @@
+from datetime import datetime, timezone
+from importlib import import_module
+import json
+from typing import Iterator
+
+import numpy as np
+from numpy import ndarray
+
+from .data_loader import iter_chunks
+from .features import PolynomialFeatures
+from .norm_eq_reg import NormEqReg
+from .regression_model import RegressionModel
+
+ARTIFACT_VERSION: int = 1
+# Arrays stored in an artifact when the model has them (beta is always stored).
+# XTX & XTy (always stored for least squares normal equation models) let a loaded model keep
+# learning with partial_fit.
+ARTIFACT_ARRAYS: tuple[str, ...] = (
+    "beta",
+    "theta",
+    "feature_means",
+    "feature_scales",
+    "XTX",
+    "XTy",
+)
+
+
+def save_model(
+    model: RegressionModel,
+    output_file_path: str,
+) -> None:
+    """Saves a fitted model as a compressed .npz artifact.
+    It holds the weights, the feature spec, the scaling parameters (if the model standardized its
+    inputs) & metadata describing how the model was trained, but none of the training data.
+    """
+    if model.beta is None:
+        raise ValueError("The model must be fit before it can be saved.")
+    metadata: dict = {
+        "version": ARTIFACT_VERSION,
+        "module": type(model).__module__,
+        "class": type(model).__name__,
+        "n": model.n,
+        "m": model.m,
+        "targets": model.targets,
+        "degree": model.feature_spec.degree,
+        "interactions": model.feature_spec.interactions,
+        "parameter_precision": model.parameter_precision,
+        "input_file_path": model.input_file_path,
+        "input_layout": model.input_layout,
+        "saved_at": datetime.now(timezone.utc).isoformat(),
+        "numpy": np.__version__,
+    }
+    # Training details that only some models have
+    for attribute in (
+        "solver_used",
+        "iterations",
+        "cost",
+        "solver",
+        "forgetting_factor",
+        "dtype",
+        "regularization",
+        "l1_ratio",
+        "weighted",
+        "loss",
+        "huber_delta",
+        "irls_iterations",
+        "irls_converged",
+    ):
+        if getattr(model, attribute, None) is not None:
+            metadata[attribute] = np.asarray(getattr(model, attribute)).item()
+    arrays: dict[str, ndarray] = {
+        name: getattr(model, name)
+        for name in ARTIFACT_ARRAYS
+        if getattr(model, name, None) is not None
+    }
+    if isinstance(model, NormEqReg) and model.loss == "squared":
+        # A model fit in one go only has its design matrix, so XTX & XTy are computed from it
+        arrays["XTX"], arrays["XTy"] = model.training_statistics()
+    with open(output_file_path, "wb") as output_file:
+        np.savez_compressed(output_file, metadata=json.dumps(metadata), **arrays)
+
+
+def load_model(
+    input_file_path: str,
+) -> RegressionModel:
+    """Loads a model saved by save_model without reading its training data.
+    The model can predict, score new data & print its regression equation right away.
+    """
+    with np.load(input_file_path) as artifact:
+        metadata: dict = json.loads(artifact["metadata"].item())
+        arrays: dict[str, ndarray] = {
+            name: artifact[name] for name in ARTIFACT_ARRAYS if name in artifact
+        }
+    if metadata["version"] != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported model artifact version: {metadata['version']}.")
+    model_class: type = getattr(import_module(metadata["module"]), metadata["class"])
+    # Skip the constructor, which would read & fit the training data again
+    model: RegressionModel = model_class.__new__(model_class)
+    model.feature_spec = PolynomialFeatures(
+        metadata["degree"], metadata["interactions"]
+    )
+    for attribute in (
+        "n",
+        "m",
+        "targets",
+        "parameter_precision",
+        "input_file_path",
+        "input_layout",
+        "solver_used",
+        "iterations",
+        "cost",
+        "solver",
+        "forgetting_factor",
+        "dtype",
+        "regularization",
+        "l1_ratio",
+        "weighted",
+        "loss",
+        "huber_delta",
+        "irls_iterations",
+        "irls_converged",
+    ):
+        if attribute in metadata:
+            setattr(model, attribute, metadata[attribute])
+    for name, array in arrays.items():
+        setattr(model, name, array)
+    model.metadata = metadata
+    return model
+
+
+def iter_predictions(
+    model: RegressionModel,
+    input_file_path: str,
+    chunk_size: int = 100_000,
+    input_layout: str = "variables",
+) -> Iterator[ndarray]:
+    """Yields the predictions of a model for a dataset file, one chunk of training examples at a time.
+    The file may hold just the n input variables or labels too (extra rows are ignored). Binary files &
+    CSV files with the "samples" layout are read one chunk at a time, so memory use stays bounded.
+    """
+    for chunk in iter_chunks(input_file_path, chunk_size, input_layout, model.n):
+        if len(chunk) < model.n:
+            raise ValueError(
+                f"The model expects {model.n} input variables, got {len(chunk)} rows."
+            )
+        yield model.predict(chunk[: model.n])
+
+
+def predict_file(
+    model: RegressionModel,
+    input_file_path: str,
+    output_file_path: str,
+    chunk_size: int = 100_000,
+    input_layout: str = "variables",
+    precision: int = None,
+) -> int:
+    """Writes the predictions of a model for a dataset file to a CSV file (one line per training example).
+    Returns the number of predictions that were written.
+    """
+    if precision is None:
+        precision = model.parameter_precision
+    count: int = 0
+    with open(output_file_path, "w") as output_file:
+        for predictions in iter_predictions(
+            model, input_file_path, chunk_size, input_layout
+        ):
+            np.savetxt(output_file, predictions, fmt=f"%.{precision}f", delimiter=",")
+            count += len(predictions)
+    return count
@@ -0,0 +1,192 @@
+from time import perf_counter
+
+import numpy as np
+from numpy import ndarray
+
+# How full-batch gradient descent picks the size of each step:
+#   "exact": the step that minimizes the cost along the gradient (closed-form for least squares)
+#   "barzilai_borwein": a step fitted to the change in gradients between the last two steps
+#   "backtracking": the largest step (halving from twice the last one) that lowers the cost enough
+LINE_SEARCH_RULES: tuple[str, ...] = ("exact", "barzilai_borwein", "backtracking")
+
+
+class LineSearch:
+    """Computes step sizes for full-batch gradient descent instead of using a fixed learning rate."""
+
+    rule: str = "exact"  # One of LINE_SEARCH_RULES
+    initial_step_size: float = 1.0  # Size of the first step (if not exact)
+    step_size: float = None  # Size of the last step taken
+    shrink: float = 0.5  # Factor backtracking shrinks the step size by
+    sufficient_decrease: float = 0.5  # Share of α·||g||² backtracking must gain
+    previous_theta: ndarray = None  # Weights before the last step ("barzilai_borwein")
+    previous_gradients: ndarray = None  # Gradients of the weights before the last step
+    regularization: float = 0.0  # L2 penalty of the cost (set by the model)
+
+    def reset(self) -> None:
+        """Forgets the last step, so the next fit starts from the initial step size."""
+        self.step_size = None
+        self.previous_theta = None
+        self.previous_gradients = None
+
+    def compute_step_size(
+        self,
+        X: ndarray,
+        theta: ndarray,
+        gradients: ndarray,
+        residuals: ndarray,
+        cost: float,
+        sample_weights: ndarray = None,
+    ) -> float:
+        """Returns the size of the step to take against the gradients from the current weights.
+        The cost is (1/2m)·||X @ theta - y||² + (λ/2)·||w||² (w are all weights but the bias), whose
+        residuals & gradients are passed in. With sample weights, every squared residual is weighted
+        & m is the total weight.
+        """
+        m: int = len(X)
+        if sample_weights is not None:
+            m = float(np.sum(sample_weights))
+            sample_weights = sample_weights.reshape(-1, *[1] * (residuals.ndim - 1))
+        squared_gradient_norm: float = np.vdot(gradients, gradients)
+        if squared_gradient_norm == 0:
+            return 0.0
+        if self.rule == "exact":
+            # d/dα (1/2m)·||r - α·Xg||² = 0  ⇒  α = m·(g·g) / ||Xg||², since X.T @ r / m = g
+            # (the penalty adds m·λ·||g_w||² to the denominator)
+            Xg: ndarray = X @ gradients
+            weighted_Xg: ndarray = Xg if sample_weights is None else sample_weights * Xg
+            step_size: float = (
+                m
+                * squared_gradient_norm
+                / (
+                    np.vdot(Xg, weighted_Xg)
+                    + m * self.regularization * np.vdot(gradients[1:], gradients[1:])
+                )
+            )
+        elif self.rule == "barzilai_borwein":
+            step_size: float = self.initial_step_size
+            if self.previous_theta is not None:
+                s: ndarray = theta - self.previous_theta
+                gradient_change: ndarray = gradients - self.previous_gradients
+                curvature: float = np.vdot(s, gradient_change)
+                if curvature > 0:
+                    step_size = np.vdot(s, s) / curvature
+            self.previous_theta = theta
+            self.previous_gradients = gradients
+        else:
+            # The residuals of every trial step are r - α·Xg, so X is only multiplied once
+            Xg: ndarray = X @ gradients
+            step_size: float = (
+                self.initial_step_size if self.step_size is None else 2 * self.step_size
+            )
+            # Armijo condition: the cost must drop by a fraction of α·||g||²
+            while step_size > np.finfo(float).eps:
+                trial_residuals: ndarray = residuals - step_size * Xg
+                weighted_trial_residuals: ndarray = (
+                    trial_residuals
+                    if sample_weights is None
+                    else sample_weights * trial_residuals
+                )
+                trial_cost: float = np.vdot(
+                    trial_residuals, weighted_trial_residuals
+                ) / (2 * m)
+                if self.regularization:
+                    trial_weights: ndarray = theta[1:] - step_size * gradients[1:]
+                    trial_cost += (
+                        self.regularization / 2 * np.vdot(trial_weights, trial_weights)
+                    )
+                decrease: float = (
+                    self.sufficient_decrease * step_size * squared_gradient_norm
+                )
+                if trial_cost <= cost - decrease:
+                    break
+                step_size *= self.shrink
+        self.step_size = step_size
+        return step_size
+
+    def __init__(
+        self,
+        rule: str = "exact",
+        initial_step_size: float = 1.0,
+    ) -> None:
+        if rule not in LINE_SEARCH_RULES:
+            raise ValueError(
+                f"'line_search' must be one of {LINE_SEARCH_RULES}, got '{rule}'."
+            )
+        self.rule = rule
+        self.initial_step_size = initial_step_size
+
+
+class ConvergenceCriteria:
+    """Decides when gradient descent should stop. Training stops as soon as any enabled rule is met.
+    By default, it stops once the cost changes by at most `tolerance` between two iterations.
+    """
+
+    tolerance: float = None  # Absolute change in cost considered insignificant
+    relative_tolerance: float = None  # Change in cost relative to the previous cost
+    gradient_tolerance: float = None  # Gradient norm considered close enough to 0
+    max_seconds: float = None  # Wall-clock budget of a fit
+    patience: int = None  # Iterations allowed without improving the best cost
+    best_cost: float = np.inf  # Lowest cost seen so far (used with patience)
+    stale_iterations: int = 0  # Iterations since the best cost last improved
+    start_time: float = None  # When the current fit started
+
+    def start(self) -> None:
+        """Resets the state of the criteria at the start of a fit."""
+        self.best_cost = np.inf
+        self.stale_iterations = 0
+        self.start_time = perf_counter()
+
+    def check(
+        self,
+        previous_cost: float,
+        cost: float,
+        gradients: ndarray = None,
+    ) -> str | None:
+        """Returns the reason to stop after an iteration, or None to keep going."""
+        change: float = abs(previous_cost - cost)
+        if self.patience is None:
+            if change <= self.tolerance:
+                return "tolerance"
+        else:
+            # With patience, a few iterations without (enough) progress are tolerated
+            if cost < self.best_cost - self.tolerance:
+                self.best_cost = cost
+                self.stale_iterations = 0
+            else:
+                self.stale_iterations += 1
+                if self.stale_iterations >= self.patience:
+                    return "patience"
+        if (
+            self.relative_tolerance is not None
+            and np.isfinite(previous_cost)
+            and change <= self.relative_tolerance * abs(previous_cost)
+        ):
+            return "relative_tolerance"
+        if (
+            self.gradient_tolerance is not None
+            and gradients is not None
+            and np.sqrt(np.vdot(gradients, gradients)) <= self.gradient_tolerance
+        ):
+            return "gradient_tolerance"
+        if (
+            self.max_seconds is not None
+            and perf_counter() - self.start_time >= self.max_seconds
+        ):
+            return "max_seconds"
+        return None
+
+    def __init__(
+        self,
+        tolerance: float = None,
+        relative_tolerance: float = None,
+        gradient_tolerance: float = None,
+        max_seconds: float = None,
+        patience: int = None,
+    ) -> None:
+        if patience is not None and patience < 1:
+            raise ValueError("'patience' must be a positive integer.")
+        self.tolerance = tolerance
+        self.relative_tolerance = relative_tolerance
+        self.gradient_tolerance = gradient_tolerance
+        self.max_seconds = max_seconds
+        self.patience = patience
@@ -0,0 +1,231 @@
+from itertools import islice
+import struct
+from typing import Iterator
+
+import numpy as np
+from numpy import ndarray
+
+# Supported CSV layouts:
+#   "variables": each line holds every value of one variable (the last line holds the labels)
+#   "samples": each line holds one training example (the last column holds the label)
+LAYOUTS: tuple[str, ...] = ("variables", "samples")
+
+# Binary dataset format: a fixed-size header followed by the raw (n+1)x(m) block,
+# stored one variable after another so each variable's values are contiguous on disk
+BINARY_EXTENSION: str = ".bin"
+BINARY_MAGIC: bytes = b"MLMDATA\x00"
+BINARY_VERSION: int = 1
+# Magic, version, dtype code, number of variables (n+1), number of training examples (m)
+BINARY_HEADER: struct.Struct = struct.Struct("<8sH2sQQ")
+BINARY_HEADER_SIZE: int = 64  # Header is padded so the data block stays aligned
+BINARY_DTYPES: dict[bytes, np.dtype] = {
+    b"f8": np.dtype("<f8"),
+    b"f4": np.dtype("<f4"),
+}
+
+# Datasets that are already in memory (e.g. shared between worker processes), keyed by
+# (file path, layout, dtype). load_dataset returns these instead of reading the file again.
+PRELOADED_DATASETS: dict[tuple[str, str, str], ndarray] = {}
+# Floating point types models can store their data & design matrix in ("float32" halves memory use)
+STORAGE_DTYPES: tuple[str, ...] = ("float64", "float32")
+
+
+def load_csv(
+    input_file_path: str,
+    layout: str = "variables",
+    min_variables: int = 2,
+    dtype: str = "float64",
+) -> ndarray:
+    """Reads a CSV file in a single pass & returns its data as an (n+1)x(m) array of floats (float64 by default).
+    Row i of the returned array holds the values of the i-th variable (the last row holds the labels).
+    Files without labels (e.g. inputs to predict) can be read by lowering min_variables.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"'layout' must be one of {LAYOUTS}, got '{layout}'.")
+    # Parse the whole file straight into one contiguous block of floats
+    data: ndarray = np.loadtxt(
+        input_file_path,
+        delimiter=",",
+        dtype=dtype,
+        ndmin=2,
+    )
+    if layout == "samples":
+        # View the (m)x(n+1) block as (n+1)x(m) without copying it
+        data = data.T
+    if len(data) < min_variables:
+        raise ValueError(
+            f"Input must have at least {min_variables} variables, got {len(data)}."
+        )
+    return data
+
+
+def create_binary(
+    output_file_path: str,
+    shape: tuple[int, int],
+    dtype: str = "float64",
+) -> np.memmap:
+    """Creates a binary dataset file for an (n+1)x(m) block & returns the block memory-mapped for writing.
+    This lets datasets that do not fit in memory be written one chunk at a time.
+    """
+    data_type: np.dtype = np.dtype(dtype).newbyteorder("<")
+    dtype_code: bytes = data_type.str[1:].encode()
+    if dtype_code not in BINARY_DTYPES:
+        raise ValueError("'dtype' must be either 'float64' or 'float32'.")
+    header: bytes = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, dtype_code, *shape)
+    with open(output_file_path, "wb") as output_file:
+        output_file.write(header.ljust(BINARY_HEADER_SIZE, b"\x00"))
+    # The block is stored in C order (one variable after another)
+    return np.memmap(
+        output_file_path,
+        dtype=data_type,
+        mode="r+",
+        offset=BINARY_HEADER_SIZE,
+        shape=shape,
+    )
+
+
+def write_binary(
+    experimental_data: ndarray,
+    output_file_path: str,
+    dtype: str = "float64",
+) -> None:
+    """Writes an (n+1)x(m) array to a binary dataset file."""
+    data: np.memmap = create_binary(output_file_path, experimental_data.shape, dtype)
+    data[:] = experimental_data
+    data.flush()
+
+
+def open_binary(
+    input_file_path: str,
+) -> np.memmap:
+    """Memory-maps a binary dataset file & returns it as a read-only (n+1)x(m) array.
+    Pages are only read from disk when the corresponding values are accessed.
+    """
+    with open(input_file_path, "rb") as input_file:
+        header: bytes = input_file.read(BINARY_HEADER.size)
+    if len(header) < BINARY_HEADER.size:
+        raise ValueError(f"'{input_file_path}' is not a binary dataset file.")
+    magic, version, dtype_code, rows, cols = BINARY_HEADER.unpack(header)
+    if magic != BINARY_MAGIC or dtype_code not in BINARY_DTYPES:
+        raise ValueError(f"'{input_file_path}' is not a binary dataset file.")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary dataset version: {version}.")
+    if rows < 2:
+        raise ValueError("Input must have at least two variables (inputs & labels).")
+    return np.memmap(
+        input_file_path,
+        dtype=BINARY_DTYPES[dtype_code],
+        mode="r",
+        offset=BINARY_HEADER_SIZE,
+        shape=(rows, cols),
+    )
+
+
+def convert_csv(
+    input_file_path: str,
+    output_file_path: str = None,
+    layout: str = "variables",
+    dtype: str = "float64",
+    chunk_size: int = 100_000,
+) -> str:
+    """Converts a CSV file to a binary dataset file & returns the path of the new file.
+    By default, the new file is written next to the CSV file with the extension swapped.
+    Files with the "samples" layout are converted one chunk of training examples at a time, so they
+    never have to fit in memory: a first pass counts the training examples, a second one copies them.
+    Files with the "variables" layout hold whole variables per line, so they are loaded at once.
+    """
+    if output_file_path is None:
+        output_file_path = input_file_path.rsplit(".", 1)[0] + BINARY_EXTENSION
+    if layout != "samples":
+        write_binary(load_csv(input_file_path, layout), output_file_path, dtype)
+        return output_file_path
+    rows: int = 0
+    m: int = 0
+    for chunk in iter_chunks(input_file_path, chunk_size, layout):
+        rows = len(chunk)
+        m += chunk.shape[1]
+    if m == 0:
+        raise ValueError("Input must have at least one training example.")
+    data: np.memmap = create_binary(output_file_path, (rows, m), dtype)
+    start: int = 0
+    for chunk in iter_chunks(input_file_path, chunk_size, layout):
+        if len(chunk) != rows:
+            raise ValueError(
+                f"Every line must hold {rows} values, got a chunk with {len(chunk)}."
+            )
+        data[:, start : start + chunk.shape[1]] = chunk
+        start += chunk.shape[1]
+        # Write the chunk out, so written pages can be dropped from memory
+        data.flush()
+    return output_file_path
+
+
+def load_dataset(
+    input_file_path: str,
+    layout: str = "variables",
+    dtype: str = "float64",
+) -> ndarray:
+    """Returns the (n+1)x(m) data of a dataset file in the given dtype.
+    Binary dataset files are memory-mapped if they were written in that dtype (& converted in
+    memory otherwise), anything else is parsed as CSV straight into the given dtype.
+    """
+    if (input_file_path, layout, dtype) in PRELOADED_DATASETS:
+        return PRELOADED_DATASETS[(input_file_path, layout, dtype)]
+    if input_file_path.endswith(BINARY_EXTENSION):
+        data: np.memmap = open_binary(input_file_path)
+        if data.dtype != np.dtype(dtype):
+            return data.astype(dtype)
+        return data
+    return load_csv(input_file_path, layout, dtype=dtype)
+
+
+def iter_chunks(
+    input_file_path: str,
+    chunk_size: int,
+    layout: str = "variables",
+    min_variables: int = 2,
+) -> Iterator[ndarray]:
+    """Yields the (n+1)x(m) data of a dataset file in (n+1)x(chunk_size) chunks.
+    Binary dataset files & CSV files with the "samples" layout are read one chunk at a time.
+    CSV files with the "variables" layout hold whole variables per line, so they are loaded first.
+    """
+    if chunk_size < 1:
+        raise ValueError("'chunk_size' must be a positive integer.")
+    if (
+        input_file_path.endswith(BINARY_EXTENSION)
+        or (input_file_path, layout, "float64") in PRELOADED_DATASETS
+    ):
+        data: ndarray = load_dataset(input_file_path, layout)
+    elif layout == "samples":
+        with open(input_file_path) as input_file:
+            while lines := list(islice(input_file, chunk_size)):
+                # Parse the lines of this chunk only
+                chunk: ndarray = np.loadtxt(
+                    lines, delimiter=",", dtype=np.float64, ndmin=2
+                ).T
+                if len(chunk) < min_variables:
+                    raise ValueError(
+                        f"Input must have at least {min_variables} variables, got {len(chunk)}."
+                    )
+                yield chunk
+        return
+    else:
+        data: ndarray = load_csv(input_file_path, layout, min_variables)
+    for start in range(0, data.shape[1], chunk_size):
+        # Copy the chunk out of the (possibly memory-mapped) data
+        yield np.array(data[:, start : start + chunk_size])
+
+
+def iter_batches(
+    m: int,
+    batch_size: int,
+    rng: np.random.Generator,
+) -> Iterator[ndarray]:
+    """Yields the indices of m training examples in shuffled batches of (at most) batch_size.
+    Every training example appears in exactly one batch per pass over the data.
+    """
+    if batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer.")
+    indices: ndarray = rng.permutation(m)
+    for start in range(0, m, batch_size):
+        yield indices[start : start + batch_size]
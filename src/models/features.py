@@ -0,0 +1,139 @@
+from itertools import combinations_with_replacement
+import os
+from typing import Callable
+
+import numpy as np
+from numpy import ndarray
+
+# Most bytes of design matrices kept in the cache at once (the oldest ones are evicted first).
+# Larger matrices are never cached & 0 turns the cache off.
+DESIGN_MATRIX_CACHE_BYTES: int = 256 * 1024**2
+# Built design matrices keyed by dataset (file, layout, modification time, size), feature spec & dtype
+DESIGN_MATRIX_CACHE: dict[tuple, ndarray] = {}
+SUPERSCRIPTS: dict[str, str] = dict(zip("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹"))
+SUBSCRIPTS: dict[str, str] = dict(zip("0123456789", "₀₁₂₃₄₅₆₇₈₉"))
+
+
+class PolynomialFeatures:
+    """Describes the columns of a polynomial design matrix & builds it.
+    Without interactions, every variable gets its own powers (x₁, x₁², ..., x₂, x₂², ...).
+    With interactions, every product of at most `degree` variables gets a column, ordered by degree.
+    """
+
+    degree: int = 1  # Highest power (or number of variables multiplied together)
+    interactions: bool = False  # Whether products of different variables are included
+
+    def terms(
+        self,
+        n: int,
+    ) -> list[tuple[int, ...]]:
+        """Returns the indices of the variables multiplied together in every column after the bias."""
+        if self.interactions:
+            return [
+                term
+                for degree in range(1, self.degree + 1)
+                for term in combinations_with_replacement(range(n), degree)
+            ]
+        return [(i,) * degree for i in range(n) for degree in range(1, self.degree + 1)]
+
+    def term_names(
+        self,
+        n: int,
+        subscripts: bool = False,
+    ) -> list[str]:
+        """Returns a readable name for every column after the bias, e.g. "(x_1)²(x_2)".
+        With subscripts, the names are written the way plot titles show them, e.g. "x₁²x₂".
+        """
+        names: list[str] = []
+        for term in self.terms(n):
+            name: str = ""
+            for i in sorted(set(term)):
+                power: int = term.count(i)
+                if subscripts:
+                    name += "x" + "".join(SUBSCRIPTS[digit] for digit in str(i + 1))
+                else:
+                    name += f"(x_{i + 1})"
+                if power > 1:
+                    name += "".join(SUPERSCRIPTS[digit] for digit in str(power))
+            names.append(name)
+        return names
+
+    def transform(
+        self,
+        features: ndarray,
+        dtype: str = "float64",
+        out: ndarray = None,
+    ) -> ndarray:
+        """Builds the (m)x(p) design matrix of (n)x(m) inputs, starting with the bias column.
+        Every column is the product of an already built column of one degree lower & one variable,
+        so no power is ever recomputed. Columns are written into one preallocated block, which is
+        stored one column after another so that each column is contiguous while it is written.
+        The block can be passed in as a (p)x(m) `out` array, so chunked callers can reuse one buffer.
+        """
+        terms: list[tuple[int, ...]] = self.terms(len(features))
+        if out is None:
+            out = np.empty((len(terms) + 1, features.shape[1]), dtype=dtype)
+        columns: ndarray = out
+        columns[0] = 1
+        column_indices: dict[tuple[int, ...], int] = {}
+        for j, term in enumerate(terms, start=1):
+            column_indices[term] = j
+            if len(term) == 1:
+                columns[j] = features[term[0]]
+            else:
+                # x₁²x₂ = (x₁²) * x₂, both of which were built before this column
+                np.multiply(
+                    columns[column_indices[term[:-1]]],
+                    columns[column_indices[term[-1:]]],
+                    out=columns[j],
+                )
+        return columns.T
+
+    def __init__(
+        self,
+        degree: int = 1,
+        interactions: bool = False,
+    ) -> None:
+        if degree < 1:
+            raise ValueError("'degree' must be a positive integer.")
+        self.degree = degree
+        self.interactions = interactions
+
+
+def cached_design_matrix(
+    input_file_path: str,
+    input_layout: str,
+    targets: int,
+    feature_spec: PolynomialFeatures,
+    build: Callable[[], ndarray],
+    dtype: str = "float64",
+    weighted: bool = False,
+) -> ndarray:
+    """Returns the design matrix of a dataset's inputs, building it only if it is not cached yet.
+    Cached matrices are read-only since every model fit on the same data shares them.
+    """
+    file_stats: os.stat_result = os.stat(input_file_path)
+    key: tuple = (
+        os.path.abspath(input_file_path),
+        input_layout,
+        file_stats.st_mtime_ns,
+        file_stats.st_size,
+        targets,
+        weighted,
+        feature_spec.degree,
+        feature_spec.interactions,
+        dtype,
+    )
+    if key in DESIGN_MATRIX_CACHE:
+        return DESIGN_MATRIX_CACHE[key]
+    design_matrix: ndarray = build()
+    design_matrix.flags.writeable = False
+    if design_matrix.nbytes <= DESIGN_MATRIX_CACHE_BYTES:
+        while (
+            sum(cached.nbytes for cached in DESIGN_MATRIX_CACHE.values())
+            + design_matrix.nbytes
+            > DESIGN_MATRIX_CACHE_BYTES
+        ):
+            del DESIGN_MATRIX_CACHE[next(iter(DESIGN_MATRIX_CACHE))]
+        DESIGN_MATRIX_CACHE[key] = design_matrix
+    return design_matrix
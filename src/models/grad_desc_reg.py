@@ -1,56 +1,488 @@
-import matplotlib.pyplot as plt
+from contextlib import nullcontext
+from typing import Iterator
+
 import numpy as np
 from numpy import ndarray
 
+from .convergence import ConvergenceCriteria, LineSearch
+from .data_loader import STORAGE_DTYPES, iter_batches
+from .features import PolynomialFeatures
+from .instrumentation import Instrumentation
+from .live_plot import SnapshotBuffer
+from .optimizers import Optimizer
+from .preprocessing import (
+    apply_standardization,
+    column_statistics,
+    descale_weights,
+    standardize_columns,
+)
 from .regression_model import RegressionModel
 
+# When the weights are rounded to parameter_precision decimal places:
+#   "training": after every step (the weights are always exactly what is printed)
+#   "display": only once training is over (training runs at full precision, which is faster &
+#              does not stall short of the optimum)
+PRECISION_MODES: tuple[str, ...] = ("training", "display")
+
 
 class GradDescReg(RegressionModel):
     alpha: float = 10e-4  # Learning rate
+    max_iterations: int = 100_000  # Most passes over the training examples fit() makes
+    iterations: int = 0  # Passes over the training examples made by the last fit()
+    optimizer: Optimizer = None  # Turns gradients into weight updates
     cost: float = (
         np.inf
     )  # Cost of hypothesis with the given weights at previous iteration
+    batch_size: int = None  # Training examples per step (None means full-batch)
+    rng: np.random.Generator = None  # Shuffles the training examples in mini-batch mode
+    theta: ndarray = None  # Weights being trained (standardized if enabled)
+    standardized: bool = False  # Whether the model trains on standardized columns
+    feature_means: ndarray = None  # Design matrix column means before standardizing
+    feature_scales: ndarray = None  # Standard deviations of those columns
+    instrumentation: Instrumentation = None  # Opt-in timers, counters & callbacks
+    precision_mode: str = "training"  # When weights are rounded (see PRECISION_MODES)
+    line_search: LineSearch = (
+        None  # Picks step sizes instead of the optimizer (full-batch only)
+    )
+    convergence: ConvergenceCriteria = None  # Decides when fit() stops
+    stop_reason: str = None  # Which rule stopped the last fit()
+    gradients: ndarray = None  # Gradients of the last step
+    chunk_size: int = None  # Rows of X built at once (None builds all of X)
+    snapshots: SnapshotBuffer = (
+        None  # Receives the weights after every pass (live plots)
+    )
+    regularization: float = 0.0  # Strength of the L2 penalty on the weights (λ)
+
+    def weigh(
+        self,
+        residuals: ndarray,
+        indices: ndarray | slice = None,
+    ) -> tuple[ndarray, float]:
+        """Returns the residuals times the sample weights of their training examples & the total weight.
+        Without sample weights, the residuals are returned as they are with their count, so the cost
+        Σ wᵢ·rᵢ² / (2·Σ wᵢ) is the usual MSE.
+        """
+        if self.sample_weights is None:
+            return residuals, len(residuals)
+        weights: ndarray = (
+            self.sample_weights if indices is None else self.sample_weights[indices]
+        )
+        return residuals * weights.reshape(-1, *[1] * (residuals.ndim - 1)), float(
+            np.sum(weights)
+        )
+
+    def penalize(
+        self,
+        cost: float,
+        gradients: ndarray,
+    ) -> tuple[float, ndarray]:
+        """Adds the L2 penalty (λ/2)·||w||² of every weight but the bias to a cost & its gradients (in place).
+        With standardization enabled, the standardized weights are penalized.
+        """
+        weights: ndarray = self.theta[1:]
+        gradients[1:] += self.regularization * weights
+        return cost + self.regularization / 2 * np.vdot(weights, weights), gradients
+
+    def f(
+        self,
+        X: ndarray = None,
+    ) -> ndarray:
+        """Returns a matrix of hypotheses for each row in the design matrix (or in the given rows of it)."""
+        if X is None:
+            if self.X is None:
+                # Chunked mode: evaluate the hypotheses one chunk of rows at a time
+                return np.concatenate(
+                    [X_chunk @ self.theta for X_chunk, _ in self.iter_design_chunks()]
+                )
+            X = self.X
+        return X @ self.theta
+
+    def build_design_matrix(self) -> ndarray:
+        """Skips the full design matrix in chunked mode, where it is built one chunk of rows at a time.
+        Standardized models build their own, since they standardize it in place (caching the raw
+        matrix as well would keep two copies of it in memory).
+        """
+        if self.chunk_size is not None:
+            return None
+        if self.standardized:
+            return self.construct_design_matrix()
+        return super().build_design_matrix()
+
+    def design_rows(
+        self,
+        indices: ndarray,
+    ) -> ndarray:
+        """Builds (& standardizes) only the rows of the design matrix for the given training examples."""
+        X: ndarray = self.construct_design_matrix(
+            self.experimental_data[: self.n, indices]
+        )
+        if self.feature_scales is not None:
+            apply_standardization(X, self.feature_means, self.feature_scales)
+        return X
 
-    def j(self) -> float:
-        """Returns the cost (MSE) of the hypothesis with the given weights."""
-        m: int = len(self.y)
-        return np.sum((self.f() - self.y) ** 2) / (2 * m)
+    def iter_design_chunks(self) -> Iterator[tuple[ndarray, ndarray]]:
+        """Yields the design matrix & labels of the training examples in chunks of chunk_size rows.
+        Every chunk is built (& standardized) in the same buffer, so at most (chunk_size)x(p) of the
+        design matrix exists at once. A chunk is overwritten by the next one.
+        """
+        buffer: ndarray = np.empty(
+            (len(self.feature_spec.terms(self.n)) + 1, min(self.chunk_size, self.m)),
+            dtype=self.dtype,
+        )
+        for start in range(0, self.m, self.chunk_size):
+            features: ndarray = self.experimental_data[
+                : self.n, start : start + self.chunk_size
+            ]
+            X: ndarray = self.feature_spec.transform(
+                features, out=buffer[:, : features.shape[1]]
+            )
+            if self.feature_scales is not None:
+                apply_standardization(X, self.feature_means, self.feature_scales)
+            yield X, self.y[start : start + self.chunk_size]
 
-    def f(self) -> ndarray:
-        """Returns a matrix of hypotheses for each row in the design matrix."""
-        hypothesis: ndarray = self.X @ self.beta
-        if np.any(np.isinf(hypothesis)) or np.any(np.isnan(hypothesis).any()):
+    def check_divergence(
+        self,
+        cost: float,
+    ) -> None:
+        """Raises an error if the cost blew up (the learning rate is too large).
+        Any inf or nan hypothesis makes the (scalar) cost inf or nan as well, so checking the cost
+        is enough & avoids scanning every hypothesis.
+        """
+        if not np.isfinite(cost):
             raise ValueError(
                 "Failed to converge. Try making learning rate (alpha) smaller."
             )
-        return hypothesis
-
-    def compute_gradients(self) -> ndarray:
-        """Returns a vector of gradients for each weight in the weights vector."""
-        y_hats: ndarray = self.f()
-        residuals: ndarray = y_hats - self.y
-        # Initialize a vector of gradients
-        num_weights: int = len(self.beta)
-        gradients: ndarray = np.zeros(num_weights)
-        # Compute gradient for each weight using partial derivatives
-        for n in range(num_weights):
-            x_n: ndarray = self.X[:, n]
-            gradients[n] = np.sum(residuals @ x_n) / self.m
-        return gradients
-
-    def update_weights(self) -> None:
-        self.beta = np.round(
-            self.beta - self.alpha * self.compute_gradients(),
+
+    def compute_cost_and_gradients(
+        self,
+        indices: ndarray = None,
+    ) -> tuple[float, ndarray]:
+        """Returns the cost (MSE) & the vector of gradients of the current weights.
+        Both are computed from the same residuals, so X @ beta is only evaluated once.
+        If indices are given, only those training examples (a mini-batch) are used.
+        """
+        if self.X is None and indices is None:
+            return self.compute_chunked_cost_and_gradients()
+        X, y = self.select_batch(indices)
+        residuals: ndarray = self.f(X) - y
+        weighted_residuals, total_weight = self.weigh(residuals, indices)
+        # With k targets, the costs of all targets are summed & X.T @ residuals is one GEMM
+        cost: float = np.vdot(residuals, weighted_residuals) / (2 * total_weight)
+        self.check_divergence(cost)
+        gradients: ndarray = X.T @ weighted_residuals / total_weight
+        if self.regularization:
+            return self.penalize(cost, gradients)
+        return cost, gradients
+
+    def compute_chunked_cost_and_gradients(self) -> tuple[float, ndarray]:
+        """Same as compute_cost_and_gradients() over all training examples, without the full design matrix.
+        The squared residuals & X.T @ residuals of every chunk are summed (in float64).
+        """
+        cost: float = 0.0
+        total_weight: float = 0.0
+        gradients: ndarray = np.zeros(self.theta.shape)
+        start: int = 0
+        for X, y in self.iter_design_chunks():
+            residuals: ndarray = self.f(X) - y
+            weighted_residuals, chunk_weight = self.weigh(
+                residuals, slice(start, start + len(y))
+            )
+            cost += float(np.vdot(residuals, weighted_residuals))
+            gradients += X.T @ weighted_residuals
+            total_weight += chunk_weight
+            start += len(y)
+        cost /= 2 * total_weight
+        self.check_divergence(cost)
+        gradients = (gradients / total_weight).astype(self.theta.dtype)
+        if self.regularization:
+            return self.penalize(cost, gradients)
+        return cost, gradients
+
+    def select_batch(
+        self,
+        indices: ndarray = None,
+    ) -> tuple[ndarray, ndarray]:
+        """Returns the rows of the design matrix & the labels of a mini-batch (or of all training examples)."""
+        if indices is None:
+            return self.X, self.y
+        if self.X is None:
+            return self.design_rows(indices), self.y[indices]
+        return self.X[indices], self.y[indices]
+
+    def step(
+        self,
+        indices: ndarray = None,
+    ) -> float:
+        """Moves the weights against the gradients & returns the cost of the weights before the step."""
+        if self.instrumentation is not None:
+            return self.instrumented_step(indices)
+        if self.line_search is not None:
+            return self.line_search_step()
+        cost, self.gradients = self.compute_cost_and_gradients(indices)
+        self.update_theta(self.optimizer.step(self.theta, self.gradients))
+        return cost
+
+    def line_search_step(self) -> float:
+        """Takes one full-batch step sized by the line search & returns the cost of the weights before the step."""
+        residuals: ndarray = self.f() - self.y
+        weighted_residuals, total_weight = self.weigh(residuals)
+        cost: float = np.vdot(residuals, weighted_residuals) / (2 * total_weight)
+        self.check_divergence(cost)
+        self.gradients = self.X.T @ weighted_residuals / total_weight
+        if self.regularization:
+            cost, self.gradients = self.penalize(cost, self.gradients)
+        self.update_theta(self.line_search_theta(residuals, cost))
+        return cost
+
+    def line_search_theta(
+        self,
+        residuals: ndarray,
+        cost: float,
+    ) -> ndarray:
+        """Returns the weights after a step against the gradients, sized by the line search."""
+        step_size: float = self.line_search.compute_step_size(
+            self.X, self.theta, self.gradients, residuals, cost, self.sample_weights
+        )
+        return self.theta - step_size * self.gradients
+
+    def update_theta(
+        self,
+        theta: ndarray,
+    ) -> None:
+        """Stores the weights after a step, rounding them first in the "training" precision mode.
+        Rounding & descaling are timed when instrumentation is attached.
+        """
+        if self.precision_mode == "display":
+            # beta is only computed (& rounded) once fit() is done
+            self.theta = theta
+            return
+        stage = (
+            nullcontext if self.instrumentation is None else self.instrumentation.stage
+        )
+        with stage("rounding"):
+            self.theta = np.round(theta, self.parameter_precision)
+        with stage("descale"):
+            self.beta = self.descale(self.theta)
+
+    def instrumented_step(
+        self,
+        indices: ndarray = None,
+    ) -> float:
+        """Same as step() (with or without a line search), but times every stage of it separately.
+        Only used when instrumentation is attached, so the plain step() stays free of overhead.
+        """
+        stage = self.instrumentation.stage
+        if self.X is None and indices is None:
+            # Chunked mode builds & multiplies every chunk in turn, so all of it is timed together
+            with stage("chunked_cost_and_gradients"):
+                cost, self.gradients = self.compute_chunked_cost_and_gradients()
+            y: ndarray = self.y
+        else:
+            with stage("select_batch"):
+                X, y = self.select_batch(indices)
+            with stage("hypothesis"):
+                hypothesis: ndarray = X @ self.theta
+            with stage("cost"):
+                residuals: ndarray = hypothesis - y
+                weighted_residuals, total_weight = self.weigh(residuals, indices)
+                cost: float = np.vdot(residuals, weighted_residuals) / (
+                    2 * total_weight
+                )
+            with stage("divergence_check"):
+                self.check_divergence(cost)
+            with stage("gradients"):
+                self.gradients = X.T @ weighted_residuals / total_weight
+        if self.regularization:
+            with stage("penalty"):
+                cost, self.gradients = self.penalize(cost, self.gradients)
+        if self.line_search is not None:
+            with stage("line_search"):
+                theta: ndarray = self.line_search_theta(residuals, cost)
+        else:
+            with stage("optimizer"):
+                theta: ndarray = self.optimizer.step(self.theta, self.gradients)
+        self.update_theta(theta)
+        self.instrumentation.count("steps")
+        self.instrumentation.count("examples", len(y))
+        return cost
+
+    def standardize(self) -> None:
+        """Makes the model train on standardized columns, so every weight sees gradients of a similar scale."""
+        if self.X is None:
+            # Chunked mode: gather the statistics in one pass & standardize every chunk as it is built
+            self.feature_scales = None
+            self.feature_means, self.feature_scales = column_statistics(
+                X for X, _ in self.iter_design_chunks()
+            )
+        else:
+            # A cached design matrix is shared with other models (& read-only), so it is copied first
+            self.X = np.require(self.X, requirements=["F", "W"])
+            self.feature_means, self.feature_scales = standardize_columns(self.X)
+
+    def select_examples(
+        self,
+        indices: ndarray,
+    ) -> None:
+        """Keeps only the given training examples (e.g. the training folds of a cross-validation).
+        Standardized models are standardized again with the statistics of the kept examples only.
+        """
+        super().select_examples(indices)
+        self.y = self.y.astype(self.dtype, copy=False)
+        if self.sample_weights is not None:
+            self.sample_weights = self.sample_weights.astype(self.dtype, copy=False)
+        if self.feature_scales is not None:
+            if self.X is not None:
+                # The kept rows were standardized with the statistics of every example
+                self.X = self.construct_design_matrix()
+            self.standardize()
+
+    def descale(
+        self,
+        theta: ndarray,
+    ) -> ndarray:
+        """Returns the trained weights in the original units of the experimental data."""
+        if self.feature_scales is None:
+            return theta
+        return np.round(
+            descale_weights(theta, self.feature_means, self.feature_scales),
             self.parameter_precision,
         )
 
+    def update_weights(self) -> float:
+        """Takes one pass over the training examples & returns its cost.
+        Full-batch mode takes a single step, mini-batch & stochastic modes take one step per
+        shuffled batch & return the average cost of those batches.
+        """
+        if self.batch_size is None:
+            return self.step()
+        total_cost: float = 0
+        for indices in iter_batches(self.m, self.batch_size, self.rng):
+            total_cost += self.step(indices) * len(indices)
+        return total_cost / self.m
+
+    def plot_trivariate(
+        self,
+    ) -> None:
+        from matplotlib.colors import LinearSegmentedColormap
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure()
+        residuals: ndarray = np.abs(
+            self.predict(self.experimental_data[: self.n]) - self.y
+        )
+        # Define colormap
+        cmap = LinearSegmentedColormap.from_list("", ["green", "yellow", "red"])
+        ax = plt.axes(projection="3d")
+        # Plot experimental data, colored by how bad each prediction is
+        scatter_plot = ax.scatter(
+            *self.experimental_data[: self.n],
+            c=residuals,
+            cmap=cmap,
+        )
+        # Add a legend (colorbar)
+        fig.colorbar(scatter_plot, ax=ax)
+        # Add labels
+        plt.title(self.format_equation(self.beta, subscripts=True), fontsize=15)
+        ax.set_xlabel("x₁", fontsize=20)
+        ax.set_ylabel("x₂", fontsize=20)
+        ax.set_zlabel("x₃", fontsize=20)
+        self.rotate_plot(ax)
+
+    def fit(self) -> "GradDescReg":
+        """Trains the weights until a stopping rule of the convergence criteria is met & returns the model.
+        Runs at full speed without plotting anything.
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.start()
+        # Start from a clean slate, in case the model was fit before
+        self.cost = np.inf
+        self.optimizer.reset()
+        if self.line_search is not None:
+            self.line_search.reset()
+        self.convergence.start()
+        self.stop_reason = "max_iterations"
+        for self.iterations in range(1, self.max_iterations + 1):
+            cost: float = self.update_weights()
+            if self.instrumentation is not None:
+                self.instrumentation.record_iteration(self, self.iterations, cost)
+            if self.snapshots is not None:
+                self.snapshots.publish(self.iterations, cost, self.theta)
+
+            stop_reason: str = self.convergence.check(self.cost, cost, self.gradients)
+            if stop_reason is not None:
+                self.stop_reason = stop_reason
+                break
+            # There was a significant change in the cost
+            self.cost = cost
+        if self.precision_mode == "display":
+            self.beta = np.round(self.descale(self.theta), self.parameter_precision)
+        if self.instrumentation is not None:
+            self.instrumentation.stop()
+        return self
+
     def __init__(
         self,
         input_file_path: str,
         parameter_precision: int,
+        input_layout: str = "variables",
+        batch_size: int = None,
+        seed: int = None,
+        optimizer: Optimizer = None,
+        standardize: bool = False,
+        targets: int = 1,
+        feature_spec: PolynomialFeatures = None,
+        precision_mode: str = "training",
+        line_search: LineSearch = None,
+        convergence: ConvergenceCriteria = None,
+        chunk_size: int = None,
+        dtype: str = "float64",
+        regularization: float = 0.0,
+        weighted: bool = False,
     ) -> None:
-        super().__init__(input_file_path)
+        if feature_spec is not None:
+            self.feature_spec = feature_spec
+        if precision_mode not in PRECISION_MODES:
+            raise ValueError(
+                f"'precision_mode' must be one of {PRECISION_MODES}, got '{precision_mode}'."
+            )
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"'dtype' must be one of {STORAGE_DTYPES}, got '{dtype}'.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("'chunk_size' must be a positive integer.")
+        if chunk_size is not None and line_search is not None:
+            raise ValueError("Line searches need the full design matrix.")
+        if regularization < 0:
+            raise ValueError("'regularization' must not be negative.")
+        self.precision_mode = precision_mode
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.weighted = weighted
+        self.standardized = standardize
+        super().__init__(input_file_path, input_layout, targets)
+        # Labels (& weights) in the storage dtype keep the residuals (& X.T @ residuals) from being upcast
+        self.y = self.y.astype(dtype, copy=False)
+        if self.sample_weights is not None:
+            self.sample_weights = self.sample_weights.astype(dtype, copy=False)
+        if standardize:
+            self.standardize()
         self.parameter_precision: int = parameter_precision
-        # Initialize weights vector, one weight for each column in design matrix
-        self.beta: ndarray = np.zeros(len(self.X.T))
-        self.visualize()
+        self.optimizer = optimizer or Optimizer(self.alpha)
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("'batch_size' must be a positive integer.")
+        if batch_size is not None and line_search is not None:
+            raise ValueError("Line searches need full-batch gradients.")
+        self.batch_size = batch_size
+        self.regularization = regularization
+        if line_search is not None:
+            line_search.regularization = regularization
+        self.line_search = line_search
+        self.convergence = convergence or ConvergenceCriteria()
+        if self.convergence.tolerance is None:
+            # By default, changes smaller than the displayed precision are insignificant
+            self.convergence.tolerance = 0.1**parameter_precision
+        self.rng = np.random.default_rng(seed)
+        # Initialize weights vector, one weight for each column in design matrix (& each target)
+        self.theta = np.zeros(
+            (len(self.feature_spec.terms(self.n)) + 1, *self.y.shape[1:]), dtype=dtype
+        )
+        self.beta: ndarray = self.descale(self.theta)
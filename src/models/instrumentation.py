@@ -0,0 +1,196 @@
+import cProfile
+from contextlib import contextmanager
+import csv
+import json
+import pstats
+from time import perf_counter
+import tracemalloc
+from typing import Callable, Iterator
+
+PROFILERS: tuple[str, ...] = ("cprofile", "tracemalloc")
+
+
+def print_progress(
+    model,
+    iteration: int,
+    cost: float,
+) -> None:
+    """Callback that prints the iteration, the cost & the current training speed."""
+    elapsed_time: float = model.instrumentation.history[-1]["elapsed_seconds"]
+    print(
+        f"iteration {iteration}: cost = {cost:.6g} "
+        f"({iteration / elapsed_time if elapsed_time else 0:.0f} iterations/s)"
+    )
+
+
+class Instrumentation:
+    """Opt-in timers, counters & callbacks for the training loops of gradient descent models.
+    Models only use it when one is attached, so training is not slowed down otherwise.
+    """
+
+    stage_seconds: dict[str, float] = None  # Total time spent in each stage
+    stage_calls: dict[str, int] = None  # Number of times each stage ran
+    counters: dict[str, int] = None  # Named event counts (steps, rows, ...)
+    history: list[dict[str, float]] = None  # Cost & elapsed time of every iteration
+    callback: Callable = None  # Called as callback(model, iteration, cost)
+    callback_every: int = 100  # Iterations between callback calls
+    profiler_name: str = None  # "cprofile", "tracemalloc" or None
+    profile: dict = None  # Summary of the last profiling run
+    start_time: float = None  # When the current run started
+    profiler: cProfile.Profile = None
+
+    @contextmanager
+    def stage(
+        self,
+        name: str,
+    ) -> Iterator[None]:
+        """Adds the time spent inside the with block to the given stage."""
+        start_time: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = (
+                self.stage_seconds.get(name, 0) + perf_counter() - start_time
+            )
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+    def count(
+        self,
+        name: str,
+        amount: int = 1,
+    ) -> None:
+        """Increments the given counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_iteration(
+        self,
+        model,
+        iteration: int,
+        cost: float,
+    ) -> None:
+        """Records the cost of an iteration & calls the callback every callback_every iterations."""
+        self.history.append(
+            {
+                "iteration": iteration,
+                "elapsed_seconds": perf_counter() - self.start_time,
+                "cost": float(cost),
+            }
+        )
+        if self.callback is not None and iteration % self.callback_every == 0:
+            self.callback(model, iteration, cost)
+
+    def reset(self) -> None:
+        """Forgets the stage timings, counters, history & profile of earlier runs."""
+        self.stage_seconds = {}
+        self.stage_calls = {}
+        self.counters = {}
+        self.history = []
+        self.profile = None
+
+    def start(self) -> None:
+        """Starts timing a training run (& profiling it, if enabled).
+        Everything recorded by an earlier run is cleared first.
+        """
+        self.reset()
+        self.start_time = perf_counter()
+        if self.profiler_name == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.profiler_name == "tracemalloc":
+            tracemalloc.start()
+
+    def stop(
+        self,
+        top: int = 15,
+    ) -> None:
+        """Stops profiling & keeps a summary of the top entries."""
+        if self.profiler_name == "cprofile":
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            # Sort functions by the time spent inside them (excluding subcalls)
+            entries = sorted(
+                stats.stats.items(), key=lambda entry: entry[1][2], reverse=True
+            )
+            self.profile = {
+                "cprofile": [
+                    {
+                        "function": f"{file_name}:{line_number}({function_name})",
+                        "calls": calls,
+                        "total_seconds": total_time,
+                        "cumulative_seconds": cumulative_time,
+                    }
+                    for (file_name, line_number, function_name), (
+                        _,
+                        calls,
+                        total_time,
+                        cumulative_time,
+                        _,
+                    ) in entries[:top]
+                ]
+            }
+        elif self.profiler_name == "tracemalloc":
+            snapshot = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.profile = {
+                "tracemalloc": {
+                    "current_bytes": current_bytes,
+                    "peak_bytes": peak_bytes,
+                    "top_allocations": [
+                        {"location": str(statistic.traceback), "bytes": statistic.size}
+                        for statistic in snapshot.statistics("lineno")[:top]
+                    ],
+                }
+            }
+
+    def to_dict(self) -> dict:
+        """Returns everything that was recorded."""
+        iterations: int = len(self.history)
+        elapsed_time: float = self.history[-1]["elapsed_seconds"] if iterations else 0
+        return {
+            "iterations": iterations,
+            "elapsed_seconds": elapsed_time,
+            "iterations_per_second": (
+                iterations / elapsed_time if elapsed_time else None
+            ),
+            "stages": {
+                name: {"seconds": seconds, "calls": self.stage_calls[name]}
+                for name, seconds in self.stage_seconds.items()
+            },
+            "counters": self.counters,
+            "profile": self.profile,
+            "history": self.history,
+        }
+
+    def export(
+        self,
+        output_file_path: str,
+    ) -> None:
+        """Writes the recorded data to a JSON file, or the per-iteration history to a CSV file."""
+        if output_file_path.endswith(".csv"):
+            with open(output_file_path, "w", newline="") as output_file:
+                writer = csv.DictWriter(
+                    output_file, fieldnames=["iteration", "elapsed_seconds", "cost"]
+                )
+                writer.writeheader()
+                writer.writerows(self.history)
+        else:
+            with open(output_file_path, "w") as output_file:
+                json.dump(self.to_dict(), output_file, indent=4)
+
+    def __init__(
+        self,
+        callback: Callable = None,
+        callback_every: int = 100,
+        profiler_name: str = None,
+    ) -> None:
+        if profiler_name is not None and profiler_name not in PROFILERS:
+            raise ValueError(
+                f"'profile' must be one of {PROFILERS}, got '{profiler_name}'."
+            )
+        if callback_every < 1:
+            raise ValueError("'callback_every' must be a positive integer.")
+        self.callback = callback
+        self.callback_every = callback_every
+        self.profiler_name = profiler_name
+        self.reset()
@@ -0,0 +1,272 @@
+from threading import Thread
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy import ndarray
+
+if TYPE_CHECKING:
+    # Matplotlib is slow to import, so it is only imported when something is plotted
+    import matplotlib.pyplot as plt
+
+    from .grad_desc_reg import GradDescReg
+
+GRID_POINTS: int = 25  # Points per axis of the grids models are drawn on
+
+
+def surface_corners(
+    heights: ndarray,
+) -> ndarray:
+    """Returns the values at the 4 corners of every quad of (...)x(g)x(g) grid values as (...)x((g-1)²)x(4).
+    Leading dimensions (e.g. one per animation frame) are handled in the same vectorized pass.
+    """
+    corners: ndarray = np.stack(
+        [
+            heights[..., :-1, :-1],
+            heights[..., :-1, 1:],
+            heights[..., 1:, 1:],
+            heights[..., 1:, :-1],
+        ],
+        axis=-1,
+    )
+    return corners.reshape(*heights.shape[:-2], -1, 4)
+
+
+def surface_vertices(
+    inputs: ndarray,
+    heights: ndarray,
+) -> ndarray:
+    """Returns the ((g-1)²)x(4)x(3) vertices of a surface over the (2)x(g²) grid inputs."""
+    x1, x2 = inputs.reshape(2, GRID_POINTS, GRID_POINTS)
+    return np.stack(
+        [
+            surface_corners(x1),
+            surface_corners(x2),
+            surface_corners(heights.reshape(GRID_POINTS, GRID_POINTS)),
+        ],
+        axis=-1,
+    )
+
+
+def create_artists(
+    fig: "plt.Figure",
+    data: ndarray,
+    n: int,
+) -> tuple["plt.Axes", "plt.Artist", ndarray]:
+    """Plots (n+1)x(m) experimental data & creates the artist that shows the model on top of it:
+    a regression curve (1 input), a regression surface (2 inputs) or residual colors (3 inputs).
+    Returns the axes, the artist & the (n)x(g) inputs the artist is evaluated at.
+    """
+    if n == 1:
+        ax = fig.add_subplot(1, 1, 1)
+        ax.scatter(*data, color="red")
+        inputs: ndarray = np.linspace(np.amin(data[0]), np.amax(data[0]), GRID_POINTS)
+        inputs = inputs[np.newaxis]
+        (artist,) = ax.plot(inputs[0], np.zeros(GRID_POINTS), color="green")
+        # Leave room for the (large) axis label below the plot
+        fig.subplots_adjust(bottom=0.2)
+    elif n == 2:
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+        ax = fig.add_subplot(1, 1, 1, projection="3d")
+        ax.scatter(*data, color="red")
+        x1, x2 = np.meshgrid(
+            np.linspace(np.amin(data[0]), np.amax(data[0]), GRID_POINTS),
+            np.linspace(np.amin(data[1]), np.amax(data[1]), GRID_POINTS),
+        )
+        inputs: ndarray = np.stack([x1.ravel(), x2.ravel()])
+        artist = Poly3DCollection(
+            surface_vertices(inputs, np.zeros(GRID_POINTS**2)),
+            color="green",
+            alpha=0.6,
+        )
+        ax.add_collection3d(artist)
+        ax.set_zlim(np.amin(data[-1]), np.amax(data[-1]))
+    else:
+        from matplotlib.colors import LinearSegmentedColormap
+
+        ax = fig.add_subplot(1, 1, 1, projection="3d")
+        inputs: ndarray = data[:n]
+        cmap = LinearSegmentedColormap.from_list("", ["green", "yellow", "red"])
+        # Experimental data, colored by how bad each prediction is
+        artist = ax.scatter(*inputs, c=np.zeros(inputs.shape[1]), cmap=cmap)
+        artist.set_clim(0, np.ptp(data[-1]))
+        # Keep the colorbar clear of the x₃ label, which moves to the right side as the plot rotates
+        fig.colorbar(artist, ax=ax, pad=0.15)
+    ax.set_xlabel("x₁", fontsize=20)
+    ax.set_ylabel("x₂" if n > 1 else "y", fontsize=20)
+    if n > 1:
+        ax.set_zlabel("y" if n == 2 else "x₃", fontsize=20)
+    return ax, artist, inputs
+
+
+class SnapshotBuffer:
+    """Holds the latest weights published by a training thread, for another thread to read.
+    Publishing only replaces a reference (the optimizers never modify weights in place), so
+    training never waits for a reader & snapshots nobody read are simply dropped.
+    """
+
+    snapshot: tuple[int, float, ndarray] = None  # Latest (iteration, cost, weights)
+    published: int = 0  # Number of snapshots published so far
+
+    def publish(
+        self,
+        iteration: int,
+        cost: float,
+        theta: ndarray,
+    ) -> None:
+        self.snapshot = (iteration, cost, theta)
+        self.published += 1
+
+    def latest(self) -> tuple[int, float, ndarray] | None:
+        return self.snapshot
+
+
+class LiveRenderer:
+    """Animates the regression curve (or surface) of a gradient descent model while it trains.
+    Training runs in a background thread that publishes its weights to a SnapshotBuffer, while the
+    main thread (which owns the GUI) draws the latest snapshot at most `fps` times per second.
+    Every artist is created once & only its data is updated. Frames are blitted onto a cached
+    background, so only the animated artists are redrawn.
+    """
+
+    model: "GradDescReg" = None  # Model being trained
+    fps: float = 30  # Most frames drawn per second
+    snapshots: SnapshotBuffer = None  # Weights published by the training thread
+    fig: "plt.Figure" = None
+    ax: "plt.Axes" = None
+    artist: "plt.Artist" = None  # Regression curve, surface or residual-colored scatter
+    status: "plt.Text" = None  # Iteration & cost of the drawn snapshot
+    background: object = None  # Canvas without the animated artists
+    inputs: ndarray = None  # (n)x(g) inputs the artist is evaluated at
+    grid: ndarray = None  # Design matrix of those inputs
+    frames: int = 0  # Number of frames drawn so far
+    error: BaseException = None  # Raised by the training thread
+
+    def setup(self) -> None:
+        """Draws the experimental data & creates the (animated) artists of the model."""
+        import matplotlib.pyplot as plt
+
+        self.fig = plt.figure()
+        self.ax, self.artist, self.inputs = create_artists(
+            self.fig, self.model.experimental_data, self.model.n
+        )
+        self.grid = self.model.construct_design_matrix(self.inputs)
+        self.status = self.fig.text(0.98, 0.02, "", ha="right")
+        for artist in (self.artist, self.status):
+            artist.set_animated(True)
+        # The cached background is stale whenever the whole figure is redrawn (e.g. on resize)
+        self.fig.canvas.mpl_connect("draw_event", self.capture_background)
+        self.fig.show()
+        self.fig.canvas.draw()
+
+    def capture_background(
+        self,
+        event: object = None,
+    ) -> None:
+        """Caches the canvas without the animated artists & draws them on top of it."""
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def update_artists(
+        self,
+        beta: ndarray,
+        label: str,
+    ) -> None:
+        """Moves the existing artists to the weights of a snapshot (without creating new ones)."""
+        hypotheses: ndarray = self.grid @ beta
+        if self.model.n == 1:
+            self.artist.set_ydata(hypotheses)
+        elif self.model.n == 2:
+            self.artist.set_verts(surface_vertices(self.inputs, hypotheses))
+        else:
+            self.artist.set_array(np.abs(hypotheses - self.model.y))
+        self.status.set_text(label)
+
+    def draw_artists(self) -> None:
+        if self.model.n > 1:
+            # 3D artists are projected when the axes are drawn, which blitting skips
+            self.artist.do_3d_projection()
+        self.fig.draw_artist(self.artist)
+        self.fig.draw_artist(self.status)
+
+    def render(
+        self,
+        snapshot: tuple[int, float, ndarray],
+    ) -> None:
+        """Blits one frame showing a snapshot of the weights."""
+        iteration, cost, theta = snapshot
+        self.update_artists(
+            self.model.descale(theta), f"Iteration {iteration}: cost = {cost:.6g}"
+        )
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self.draw_artists()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self.frames += 1
+
+    def train(self) -> None:
+        """Fits the model (in the training thread), keeping any error for the main thread."""
+        try:
+            self.model.fit()
+        except BaseException as error:
+            self.error = error
+
+    def run(self) -> "GradDescReg":
+        """Trains the model while animating it & returns the model once the final frame is drawn."""
+        import matplotlib.pyplot as plt
+
+        self.setup()
+        self.model.snapshots = self.snapshots
+        thread: Thread = Thread(target=self.train, daemon=True)
+        frame_interval: float = 1 / self.fps
+        rendered: int = 0
+        thread.start()
+        while thread.is_alive():
+            frame_start: float = perf_counter()
+            # Skip frames while nothing new was published or the window was closed
+            if self.snapshots.published > rendered and plt.fignum_exists(
+                self.fig.number
+            ):
+                rendered = self.snapshots.published
+                self.render(self.snapshots.latest())
+            # Sleeping (instead of polling the GUI) leaves the interpreter to the training thread
+            sleep(max(0.0, frame_interval - (perf_counter() - frame_start)))
+        thread.join()
+        self.model.snapshots = None
+        if self.error is not None:
+            raise self.error
+        # Show the fitted model with all of its artists drawn normally
+        self.update_artists(
+            self.model.beta, f"Done after {self.model.iterations} iterations"
+        )
+        for artist in (self.artist, self.status):
+            artist.set_animated(False)
+        self.ax.set_title(
+            self.model.format_equation(self.model.beta, subscripts=True), fontsize=15
+        )
+        self.fig.canvas.draw()
+        return self.model
+
+    def show(self) -> None:
+        """Keeps the final frame on screen until the user closes it."""
+        import matplotlib.pyplot as plt
+
+        plt.ioff()
+        plt.show(block=True)
+
+    def __init__(
+        self,
+        model: "GradDescReg",
+        fps: float = 30,
+    ) -> None:
+        if model.targets > 1 or model.n > 3 or model.experimental_data is None:
+            raise ValueError(
+                "Live plots need a single target & at most 3 input variables."
+            )
+        if fps <= 0:
+            raise ValueError("'fps' must be positive.")
+        self.model = model
+        self.fps = fps
+        self.snapshots = SnapshotBuffer()
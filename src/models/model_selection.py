@@ -0,0 +1,196 @@
+from copy import deepcopy
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+from numpy import ndarray
+
+from .norm_eq_reg import NormEqReg
+from .regression_model import RegressionModel
+from .solvers import scale_rows, solve_least_squares, try_cholesky
+
+
+def k_fold_indices(
+    m: int,
+    folds: int = 5,
+    seed: int = None,
+) -> list[ndarray]:
+    """Splits the indices of m shuffled training examples into `folds` validation folds of (almost) equal size."""
+    if not 2 <= folds <= m // 2:
+        raise ValueError(
+            f"'folds' must be between 2 & half the number of training examples ({m // 2})."
+        )
+    return np.array_split(np.random.default_rng(seed).permutation(m), folds)
+
+
+def grid_candidates(
+    space: dict[str, list],
+) -> list[dict]:
+    """Returns every combination of the values of a search space, e.g.
+    {"regression_type": ["linear", "quadratic"], "learning_rate": [0.01, 0.1]} has 4 candidates.
+    """
+    return [dict(zip(space, values)) for values in product(*space.values())]
+
+
+def random_candidates(
+    space: dict[str, list | dict],
+    count: int,
+    seed: int = None,
+) -> list[dict]:
+    """Returns `count` candidates drawn at random from a search space.
+    A key maps to a list of values (one is picked uniformly) or to a range to sample from:
+    {"uniform": [low, high]}, {"log_uniform": [low, high]} or {"integer": [low, high]} (inclusive).
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    candidates: list[dict] = []
+    for _ in range(count):
+        candidate: dict = {}
+        for key, values in space.items():
+            if isinstance(values, list):
+                candidate[key] = values[rng.integers(len(values))]
+            elif "uniform" in values:
+                candidate[key] = float(rng.uniform(*values["uniform"]))
+            elif "log_uniform" in values:
+                low, high = np.log(values["log_uniform"])
+                candidate[key] = float(np.exp(rng.uniform(low, high)))
+            elif "integer" in values:
+                low, high = values["integer"]
+                candidate[key] = int(rng.integers(low, high + 1))
+            else:
+                raise ValueError(
+                    f"'{key}' must be a list of values or a 'uniform', 'log_uniform' or 'integer' range."
+                )
+        candidates.append(candidate)
+    return candidates
+
+
+def validation_scores(
+    model: RegressionModel,
+    beta: ndarray,
+    features: ndarray,
+    labels: ndarray,
+) -> tuple[float, float]:
+    """Returns the R² (averaged over the targets) & the MSE of weights on held-out training examples."""
+    residuals: ndarray = labels - model.construct_design_matrix(features) @ beta
+    deviations: ndarray = labels - np.mean(labels, axis=0)
+    r_squared: ndarray = 1 - np.einsum(
+        "i...,i...->...", residuals, residuals
+    ) / np.einsum("i...,i...->...", deviations, deviations)
+    return float(np.mean(r_squared)), float(
+        np.vdot(residuals, residuals) / residuals.size
+    )
+
+
+def cross_validate_normal_equation(
+    model: NormEqReg,
+    validation_folds: list[ndarray],
+) -> list[tuple[float, float]]:
+    """Returns the validation R² & MSE of a normal equation model on every fold.
+    XTX & XTy are computed once for all training examples & the weights of each fold are solved from
+    (XTX - X_f.T @ X_f) & (XTy - X_f.T @ y_f), where X_f & y_f only hold the validation fold. This costs
+    about 2 passes over the data in total, instead of (folds - 1) passes to refit every fold.
+    Regularized models solve every fold with their penalty (see NormEqReg.solve_normal_equation).
+    Like a full fit, the "auto" solver only keeps a fold's Cholesky solution if the fold's XTX is
+    well-conditioned, otherwise that fold is refit with QR on its training rows.
+    Weighted models work on rows scaled by the square roots of their sample weights.
+    """
+    X, scaled_y = scale_rows(model.X, model.y, model.sample_weights)
+    y: ndarray = model.y
+    data: ndarray = model.experimental_data
+    scores: list[tuple[float, float]] = []
+    if model.solver in ("qr", "lstsq") and model.regularization == 0:
+        # These solvers factor the rows of X themselves, so every fold is refit
+        for validation in validation_folds:
+            training: ndarray = np.setdiff1d(np.arange(model.m), validation)
+            beta, _ = solve_least_squares(X[training], scaled_y[training], model.solver)
+            beta = np.round(beta, model.parameter_precision)
+            scores.append(
+                validation_scores(
+                    model, beta, data[: model.n, validation], y[validation]
+                )
+            )
+        return scores
+    XTX: ndarray = X.T @ X
+    XTy: ndarray = X.T @ scaled_y
+    for validation in validation_folds:
+        X_fold: ndarray = X[validation]
+        fold_XTX: ndarray = XTX - X_fold.T @ X_fold
+        fold_XTy: ndarray = XTy - X_fold.T @ scaled_y[validation]
+        if model.solver == "auto" and model.regularization == 0:
+            beta: ndarray = try_cholesky(fold_XTX, fold_XTy)
+            if beta is None:
+                training: ndarray = np.setdiff1d(np.arange(model.m), validation)
+                beta, _ = solve_least_squares(X[training], scaled_y[training], "qr")
+        else:
+            beta, _ = model.solve_normal_equation(fold_XTX, fold_XTy)
+        beta = np.round(beta, model.parameter_precision)
+        scores.append(
+            validation_scores(model, beta, data[: model.n, validation], y[validation])
+        )
+    return scores
+
+
+def cross_validate(
+    model: RegressionModel,
+    folds: int = 5,
+    seed: int = None,
+) -> dict:
+    """Returns the k-fold cross-validation scores of an (unfitted) model.
+    Least squares normal equation models solve every fold from one global XTX & XTy. Any other
+    model is copied for every fold, restricted to the training folds (see select_examples) & fit
+    from scratch.
+    """
+    if model.experimental_data is None:
+        raise ValueError("Cross-validation needs the data in memory (no 'chunk_size').")
+    start_time: float = perf_counter()
+    data: ndarray = model.experimental_data
+    labels: ndarray = model.y
+    validation_folds: list[ndarray] = k_fold_indices(model.m, folds, seed)
+    if isinstance(model, NormEqReg) and model.loss == "squared":
+        scores: list[tuple[float, float]] = cross_validate_normal_equation(
+            model, validation_folds
+        )
+        iterations: list[int] = []
+    else:
+        scores: list[tuple[float, float]] = []
+        iterations: list[int] = []
+        # Copies of the model share its (read-only) data instead of copying it
+        shared: dict = {
+            id(array): array for array in (model.X, data, labels, model.sample_weights)
+        }
+        for validation in validation_folds:
+            fold_model: RegressionModel = deepcopy(model, dict(shared))
+            fold_model.select_examples(np.setdiff1d(np.arange(model.m), validation))
+            fold_model.fit()
+            iterations.append(getattr(fold_model, "iterations", 0))
+            scores.append(
+                validation_scores(
+                    fold_model,
+                    fold_model.beta,
+                    data[: model.n, validation],
+                    labels[validation],
+                )
+            )
+    r_squared, mse = np.array(scores).T
+    return {
+        "folds": folds,
+        "mean_r_squared": round(float(np.mean(r_squared)), 6),
+        "std_r_squared": round(float(np.std(r_squared)), 6),
+        "mean_mse": round(float(np.mean(mse)), 6),
+        "fold_r_squared": np.round(r_squared, 6).tolist(),
+        "mean_iterations": float(np.mean(iterations)) if iterations else None,
+        "seconds": round(perf_counter() - start_time, 6),
+    }
+
+
+def rank_results(
+    results: list[dict],
+) -> list[dict]:
+    """Sorts search results from best to worst & numbers them (failed candidates come last, unranked)."""
+    succeeded: list[dict] = sorted(
+        (result for result in results if result["status"] == "ok"),
+        key=lambda result: (-result["mean_r_squared"], result["mean_mse"]),
+    )
+    for rank, result in enumerate(succeeded, start=1):
+        result["rank"] = rank
+    return succeeded + [result for result in results if result["status"] != "ok"]
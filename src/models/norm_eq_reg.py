@@ -1,44 +1,294 @@
-import matplotlib.pyplot as plt
+from time import perf_counter
+
 import numpy as np
 from numpy import ndarray
 
+from .data_loader import iter_chunks
+from .features import PolynomialFeatures
 from .regression_model import RegressionModel
+from .regularization import elastic_net_path, ridge_path, solve_regularized
+from .robust import LOSSES, ZERO_SCALE, huber_weights, robust_scale
+from .solvers import scale_rows, solve_gram, solve_least_squares
 
 
 class NormEqReg(RegressionModel):
+    chunk_size: int = None  # Number of training examples per chunk in streaming mode
+    solver: str = "auto"  # Requested solver backend (see models/solvers.py)
+    solver_used: str = None  # Solver backend that actually computed beta
+    solve_time: float = None  # Time spent solving for beta (in seconds)
+    XTX: ndarray = None  # Accumulated XTX (kept in streaming & online modes)
+    XTy: ndarray = None  # Accumulated XTy (a (p)x(k) matrix with k targets)
+    forgetting_factor: float = 1.0  # Weight kept by older data on every partial_fit
+    regularization: float = 0.0  # Strength of the penalty on the weights (λ)
+    l1_ratio: float = 0.0  # Share of the penalty that is L1 (0 is ridge, 1 is lasso)
+    loss: str = "squared"  # Loss minimized by fit() (see LOSSES)
+    huber_delta: float = (
+        1.345  # Robust standard deviations where the Huber loss turns linear
+    )
+    max_irls_iterations: int = 50  # Most reweighting iterations of a robust fit
+    irls_tolerance: float = 1e-4  # Largest change of a robust weight considered stable
+    irls_iterations: int = 0  # Reweighting iterations of the last robust fit
+    irls_converged: bool = False  # Whether the weights of the last robust fit settled
+    robust_weights: ndarray = (
+        None  # Huber weight of every training example after a robust fit
+    )
+
+    def solve_normal_equation(
+        self,
+        XTX: ndarray,
+        XTy: ndarray,
+    ) -> tuple[ndarray, str]:
+        """Solves for the weights from XTX & XTy with the configured solver, or with the penalty if
+        the model is regularized (see models/regularization.py). Returns beta & the solver that was used.
+        """
+        if self.regularization == 0:
+            return solve_gram(XTX, XTy, self.solver)
+        return solve_regularized(XTX, XTy, self.regularization, self.l1_ratio)
+
     def compute_beta(
         self,
         precision: int,
     ) -> ndarray:
-        # Transpose design matrix & multiply by design matrix
-        XTX: ndarray = self.X.T @ self.X
-        # Transpose design matrix & multiply by y
-        XTy: ndarray = self.X.T @ self.y
-        # Multiply inverse of XTX by XTy
-        beta: ndarray = np.linalg.pinv(XTX) @ XTy
+        start_time: float = perf_counter()
+        if self.loss == "huber":
+            beta: ndarray = self.compute_robust_beta()
+        else:
+            # Weighted least squares is ordinary least squares on rows scaled by √(sample weight)
+            X, y = scale_rows(self.X, self.y, self.sample_weights)
+            if self.regularization == 0:
+                beta, self.solver_used = solve_least_squares(X, y, self.solver)
+            else:
+                # The penalty keeps XTX well-conditioned, so it is solved from XTX directly
+                beta, self.solver_used = self.solve_normal_equation(X.T @ X, X.T @ y)
+        self.solve_time = perf_counter() - start_time
         # Return beta with all values rounded to the specified precision
-        return np.array([round(beta_i, precision) for beta_i in beta])
+        return np.round(beta, precision)
+
+    def compute_robust_beta(self) -> ndarray:
+        """Fits the Huber loss by iteratively reweighted least squares (IRLS).
+        Every iteration solves the normal equation weighted by the Huber weights of the last residuals
+        (see models/robust.py), so outliers count less & less. Most training examples keep a weight of 1
+        from one iteration to the next, so XTWX & XTWy are only corrected by the rows whose weight changed
+        (O(changed·p²)) instead of being rebuilt from every row (O(m·p²)). Stops as soon as no weight
+        changes by more than irls_tolerance (irls_converged tells whether that happened within
+        max_irls_iterations). If more than half of the training examples are fit exactly, the robust
+        scale is 0 & every other example would be an outlier, so the least squares fit is kept.
+        """
+        sample_weights: ndarray = (
+            np.ones(self.m) if self.sample_weights is None else self.sample_weights
+        )
+        self.robust_weights = np.ones(self.m)
+        XTX: ndarray = self.X.T @ (self.X * sample_weights[:, np.newaxis])
+        XTy: ndarray = self.X.T @ (sample_weights * self.y)
+        self.irls_converged = False
+        for self.irls_iterations in range(1, self.max_irls_iterations + 1):
+            beta, self.solver_used = self.solve_normal_equation(XTX, XTy)
+            residuals: ndarray = self.y - self.X @ beta
+            if robust_scale(residuals) <= ZERO_SCALE * np.amax(np.abs(self.y)):
+                # No residual is large relative to a scale of 0, so reweighting cannot help
+                self.irls_converged = True
+                break
+            weights: ndarray = huber_weights(residuals, self.huber_delta)
+            changes: ndarray = weights - self.robust_weights
+            self.irls_converged = np.amax(np.abs(changes)) <= self.irls_tolerance
+            if self.irls_converged or self.irls_iterations == self.max_irls_iterations:
+                break
+            changed: ndarray = np.flatnonzero(changes)
+            if len(changed) > self.m // 2:
+                # Rebuilding is cheaper than correcting most of the rows
+                combined: ndarray = sample_weights * weights
+                XTX = self.X.T @ (self.X * combined[:, np.newaxis])
+                XTy = self.X.T @ (combined * self.y)
+            else:
+                X_changed: ndarray = self.X[changed]
+                deltas: ndarray = changes[changed] * sample_weights[changed]
+                XTX = XTX + X_changed.T @ (X_changed * deltas[:, np.newaxis])
+                XTy = XTy + X_changed.T @ (deltas * self.y[changed])
+            self.robust_weights = weights
+        return beta
 
-    def rotate_plot(
+    def accumulate(
         self,
-        ax: plt.axes,
+        data: ndarray,
     ) -> None:
-        angle = 0
-        while True:
-            # Normalize the angle to the range [-180, 180]
-            angle_norm = (angle + 180) % 360 - 180
-            # Update the axis view
-            ax.view_init(elev=20, azim=angle_norm)
-            plt.draw()
-            plt.pause(0.01)
-            angle += 2
+        """Adds the contribution of (n+k)x(b) data (inputs & labels, then sample weights if weighted) to
+        XTX & XTy. Costs O(b·p²), no matter how much data was accumulated before.
+        """
+        data, sample_weights = self.split_sample_weights(data)
+        if self.XTX is None:
+            self.n = len(data) - self.targets  # Minus the label rows
+        elif len(data) - self.targets != self.n:
+            raise ValueError(
+                f"The model has {self.n} input variables, got {len(data) - self.targets}."
+            )
+        # Build the rows of the design matrix for this data only
+        X_batch, y_batch = scale_rows(
+            self.construct_design_matrix(data[: self.n]),
+            self.split_labels(data),
+            sample_weights,
+        )
+        if self.XTX is None:
+            self.XTX = np.zeros((X_batch.shape[1], X_batch.shape[1]))
+            self.XTy = np.zeros((X_batch.shape[1], *y_batch.shape[1:]))
+            self.m = 0
+        self.XTX += X_batch.T @ X_batch
+        self.XTy += X_batch.T @ y_batch
+        self.m += len(X_batch)
+
+    def compute_beta_from_statistics(
+        self,
+        precision: int,
+    ) -> ndarray:
+        """Solves the normal equation from the accumulated XTX & XTy (a (p)x(p) system)."""
+        start_time: float = perf_counter()
+        beta, self.solver_used = self.solve_normal_equation(self.XTX, self.XTy)
+        self.solve_time = perf_counter() - start_time
+        # Return beta with all values rounded to the specified precision
+        return np.round(beta, precision)
+
+    def compute_beta_streaming(
+        self,
+        input_file_path: str,
+        input_layout: str,
+        precision: int,
+    ) -> ndarray:
+        """Computes beta without ever holding the full design matrix in memory.
+        XTX & XTy are accumulated chunk by chunk, so only O(p²) memory is kept between chunks.
+        With k targets, XTy is a (p)x(k) matrix & XTX is still only factored once.
+        """
+        self.XTX = None
+        self.XTy = None
+        for chunk in iter_chunks(input_file_path, self.chunk_size, input_layout):
+            self.accumulate(chunk)
+        if self.XTX is None:
+            raise ValueError("Input must have at least one training example.")
+        return self.compute_beta_from_statistics(precision)
+
+    def training_statistics(self) -> tuple[ndarray, ndarray]:
+        """Returns XTX & XTy of the training data: the accumulated ones if there are any, otherwise
+        they are computed from the design matrix. Returns (None, None) if the model has neither.
+        """
+        if self.XTX is not None:
+            return self.XTX, self.XTy
+        if self.X is None:
+            return None, None
+        X, y = scale_rows(self.X, self.y, self.sample_weights)
+        return X.T @ X, X.T @ y
+
+    def partial_fit(
+        self,
+        data: ndarray,
+    ) -> "NormEqReg":
+        """Updates the weights with a new batch of (n+k)x(b) data (one row per variable, labels last).
+        Only XTX & XTy are updated, so the cost of an update depends on the batch size & p, not on
+        the number of training examples seen so far. With a forgetting factor below 1, the existing
+        statistics are scaled down first, so older training examples gradually lose their weight.
+        """
+        if self.loss == "huber":
+            raise ValueError("Robust fits need all of the training examples at once.")
+        if self.XTX is None:
+            # Start from the statistics of the data the model was fit on
+            self.XTX, self.XTy = self.training_statistics()
+            if self.XTX is None and self.beta is not None:
+                raise ValueError(
+                    "The model has weights but no XTX & XTy to continue learning from."
+                )
+        if self.XTX is not None and self.forgetting_factor != 1:
+            self.XTX *= self.forgetting_factor
+            self.XTy *= self.forgetting_factor
+        self.accumulate(np.asarray(data))
+        self.beta = self.compute_beta_from_statistics(self.parameter_precision)
+        return self
+
+    def regularization_path(
+        self,
+        penalties: list[float],
+    ) -> ndarray:
+        """Returns the (L)x(p)[x(k)] weights of the model for every penalty (without changing the model).
+        Ridge models decompose XTX once for the whole path, while L1 & elastic net models solve the
+        penalties in order, each warm started from the last (largest penalties should come first).
+        Penalties must be positive (fit() solves the unpenalized model).
+        """
+        if np.amin(penalties) <= 0:
+            raise ValueError("Penalties must be positive.")
+        XTX, XTy = self.training_statistics()
+        if XTX is None:
+            raise ValueError(
+                "The model must be fit before it has a regularization path."
+            )
+        if self.l1_ratio == 0:
+            path: ndarray = ridge_path(XTX, XTy, penalties)
+        else:
+            path: ndarray = elastic_net_path(XTX, XTy, penalties, self.l1_ratio)
+        return np.round(path, self.parameter_precision)
+
+    def fit(self) -> "NormEqReg":
+        """Solves the normal equation for the weights vector (or matrix) & returns the model.
+        With k targets, XTX is factored once & all k right-hand sides are solved together.
+        """
+        if self.chunk_size is None:
+            # Statistics of earlier partial_fit calls no longer match the weights
+            self.XTX = None
+            self.XTy = None
+            self.beta = self.compute_beta(self.parameter_precision)
+        else:
+            self.beta = self.compute_beta_streaming(
+                self.input_file_path, self.input_layout, self.parameter_precision
+            )
+        return self
 
     def __init__(
         self,
         input_file_path: str,
         parameter_precision: int,
+        input_layout: str = "variables",
+        chunk_size: int = None,
+        solver: str = "auto",
+        targets: int = 1,
+        feature_spec: PolynomialFeatures = None,
+        forgetting_factor: float = 1.0,
+        regularization: float = 0.0,
+        l1_ratio: float = 0.0,
+        weighted: bool = False,
+        loss: str = "squared",
+        huber_delta: float = 1.345,
     ) -> None:
-        super().__init__(input_file_path)
+        if feature_spec is not None:
+            self.feature_spec = feature_spec
+        if not 0 < forgetting_factor <= 1:
+            raise ValueError("'forgetting_factor' must be in the range (0, 1].")
+        if regularization < 0:
+            raise ValueError("'regularization' must not be negative.")
+        if not 0 <= l1_ratio <= 1:
+            raise ValueError("'l1_ratio' must be in the range [0, 1].")
+        if loss not in LOSSES:
+            raise ValueError(f"'loss' must be one of {LOSSES}, got '{loss}'.")
+        if loss == "huber":
+            if chunk_size is not None or input_file_path is None:
+                raise ValueError(
+                    "Robust fits need all of the training examples at once."
+                )
+            if targets > 1:
+                raise ValueError("Robust fits only support a single target.")
+            if solver in ("qr", "lstsq"):
+                raise ValueError(
+                    f"Robust fits solve from XTX, so 'solver' cannot be '{solver}'."
+                )
+            if huber_delta <= 0:
+                raise ValueError("'huber_delta' must be positive.")
+        self.forgetting_factor = forgetting_factor
+        self.regularization = regularization
+        self.l1_ratio = l1_ratio
+        self.weighted = weighted
+        self.loss = loss
+        self.huber_delta = huber_delta
         self.parameter_precision: int = parameter_precision
-        self.beta = self.compute_beta(parameter_precision)
-        self.visualize()
+        self.targets = targets
+        self.solver = solver
+        self.input_file_path = input_file_path
+        self.input_layout = input_layout
+        self.chunk_size = chunk_size
+        if chunk_size is None and input_file_path is not None:
+            super().__init__(input_file_path, input_layout, targets)
+        # In streaming mode, the data is only read (one chunk at a time) by fit().
+        # Without an input file, the model is trained online with partial_fit().
@@ -0,0 +1,258 @@
+from math import cos, pi
+from typing import Callable
+
+import numpy as np
+from numpy import ndarray
+
+# A learning rate schedule maps the number of steps taken so far to a learning rate multiplier
+Schedule = Callable[[int], float]
+
+
+def constant_schedule() -> Schedule:
+    """Keeps the learning rate fixed."""
+    return lambda iteration: 1.0
+
+
+def step_schedule(
+    step_size: int = 1000,
+    gamma: float = 0.5,
+) -> Schedule:
+    """Multiplies the learning rate by gamma every step_size steps."""
+    return lambda iteration: gamma ** (iteration // step_size)
+
+
+def exponential_schedule(
+    gamma: float = 0.999,
+) -> Schedule:
+    """Multiplies the learning rate by gamma after every step."""
+    return lambda iteration: gamma**iteration
+
+
+def cosine_schedule(
+    period: int = 100_000,
+    minimum: float = 0.0,
+) -> Schedule:
+    """Anneals the learning rate from its full value down to minimum (a fraction of it) over period steps."""
+    return lambda iteration: minimum + (1 - minimum) * 0.5 * (
+        1 + cos(pi * min(iteration, period) / period)
+    )
+
+
+SCHEDULES: dict[str, Callable[..., Schedule]] = {
+    "constant": constant_schedule,
+    "step": step_schedule,
+    "exponential": exponential_schedule,
+    "cosine": cosine_schedule,
+}
+
+
+class Optimizer:
+    """Plain gradient descent: beta := beta - alpha * gradients."""
+
+    learning_rate: float = 10e-4  # Base learning rate (alpha)
+    schedule: Schedule = None  # Learning rate multiplier for each step
+    iteration: int = 0  # Number of steps taken so far
+
+    def current_learning_rate(self) -> float:
+        """Returns the learning rate for the next step."""
+        return self.learning_rate * self.schedule(self.iteration)
+
+    def reset(self) -> None:
+        """Forgets the steps taken so far, so the next fit starts from the first step of the schedule."""
+        self.iteration = 0
+
+    def compute_update(
+        self,
+        gradients: ndarray,
+        learning_rate: float,
+    ) -> ndarray:
+        """Returns the amount to subtract from the weights."""
+        return learning_rate * gradients
+
+    def step(
+        self,
+        beta: ndarray,
+        gradients: ndarray,
+    ) -> ndarray:
+        """Returns the weights after taking one step against the gradients."""
+        update: ndarray = self.compute_update(gradients, self.current_learning_rate())
+        self.iteration += 1
+        return beta - update
+
+    def __init__(
+        self,
+        learning_rate: float = 10e-4,
+        schedule: Schedule = None,
+    ) -> None:
+        self.learning_rate = learning_rate
+        self.schedule = schedule or constant_schedule()
+        self.iteration = 0
+
+
+class Momentum(Optimizer):
+    """Gradient descent with momentum: steps along a decaying sum of past gradients."""
+
+    momentum: float = 0.9  # Fraction of the previous velocity that is kept
+    velocity: ndarray = None  # Running sum of past gradients
+
+    def reset(self) -> None:
+        super().reset()
+        self.velocity = None
+
+    def compute_update(
+        self,
+        gradients: ndarray,
+        learning_rate: float,
+    ) -> ndarray:
+        if self.velocity is None:
+            self.velocity = np.zeros_like(gradients)
+        self.velocity = self.momentum * self.velocity + gradients
+        return learning_rate * self.velocity
+
+    def __init__(
+        self,
+        learning_rate: float = 10e-4,
+        schedule: Schedule = None,
+        momentum: float = 0.9,
+    ) -> None:
+        super().__init__(learning_rate, schedule)
+        self.momentum = momentum
+        self.velocity = None
+
+
+class Nesterov(Momentum):
+    """Nesterov accelerated gradient: applies the momentum step before looking at the gradient.
+    Uses the equivalent form that only needs the gradient at the current weights.
+    """
+
+    def compute_update(
+        self,
+        gradients: ndarray,
+        learning_rate: float,
+    ) -> ndarray:
+        super().compute_update(gradients, learning_rate)
+        return learning_rate * (gradients + self.momentum * self.velocity)
+
+
+class RMSProp(Optimizer):
+    """Scales each weight's step by a running average of its squared gradients."""
+
+    decay: float = 0.9  # Fraction of the previous average that is kept
+    epsilon: float = 1e-8  # Avoids dividing by zero
+    squared_gradients: ndarray = None  # Running average of the squared gradients
+
+    def reset(self) -> None:
+        super().reset()
+        self.squared_gradients = None
+
+    def compute_update(
+        self,
+        gradients: ndarray,
+        learning_rate: float,
+    ) -> ndarray:
+        if self.squared_gradients is None:
+            self.squared_gradients = np.zeros_like(gradients)
+        self.squared_gradients = (
+            self.decay * self.squared_gradients + (1 - self.decay) * gradients**2
+        )
+        return (
+            learning_rate * gradients / (np.sqrt(self.squared_gradients) + self.epsilon)
+        )
+
+    def __init__(
+        self,
+        learning_rate: float = 10e-4,
+        schedule: Schedule = None,
+        decay: float = 0.9,
+        epsilon: float = 1e-8,
+    ) -> None:
+        super().__init__(learning_rate, schedule)
+        self.decay = decay
+        self.epsilon = epsilon
+        self.squared_gradients = None
+
+
+class Adam(Optimizer):
+    """Combines momentum with RMSProp's per-weight scaling (both bias-corrected)."""
+
+    beta1: float = 0.9  # Decay rate of the running average of the gradients
+    beta2: float = 0.999  # Decay rate of the running average of the squared gradients
+    epsilon: float = 1e-8  # Avoids dividing by zero
+    first_moment: ndarray = None  # Running average of the gradients
+    second_moment: ndarray = None  # Running average of the squared gradients
+
+    def reset(self) -> None:
+        super().reset()
+        self.first_moment = None
+        self.second_moment = None
+
+    def compute_update(
+        self,
+        gradients: ndarray,
+        learning_rate: float,
+    ) -> ndarray:
+        if self.first_moment is None:
+            self.first_moment = np.zeros_like(gradients)
+            self.second_moment = np.zeros_like(gradients)
+        self.first_moment = (
+            self.beta1 * self.first_moment + (1 - self.beta1) * gradients
+        )
+        self.second_moment = (
+            self.beta2 * self.second_moment + (1 - self.beta2) * gradients**2
+        )
+        # Correct the bias towards zero of the first few steps
+        t: int = self.iteration + 1
+        first_moment_hat: ndarray = self.first_moment / (1 - self.beta1**t)
+        second_moment_hat: ndarray = self.second_moment / (1 - self.beta2**t)
+        return (
+            learning_rate
+            * first_moment_hat
+            / (np.sqrt(second_moment_hat) + self.epsilon)
+        )
+
+    def __init__(
+        self,
+        learning_rate: float = 10e-4,
+        schedule: Schedule = None,
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        epsilon: float = 1e-8,
+    ) -> None:
+        super().__init__(learning_rate, schedule)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.first_moment = None
+        self.second_moment = None
+
+
+OPTIMIZERS: dict[str, type[Optimizer]] = {
+    "gradient_descent": Optimizer,
+    "momentum": Momentum,
+    "nesterov": Nesterov,
+    "rmsprop": RMSProp,
+    "adam": Adam,
+}
+
+
+def make_optimizer(
+    name: str = "gradient_descent",
+    learning_rate: float = 10e-4,
+    schedule: str = "constant",
+    optimizer_options: dict[str, float] = None,
+    schedule_options: dict[str, float] = None,
+) -> Optimizer:
+    """Returns the optimizer & learning rate schedule with the given names."""
+    if name not in OPTIMIZERS:
+        raise ValueError(
+            f"'optimizer' must be one of {tuple(OPTIMIZERS)}, got '{name}'."
+        )
+    if schedule not in SCHEDULES:
+        raise ValueError(
+            f"'learning_rate_schedule' must be one of {tuple(SCHEDULES)}, got '{schedule}'."
+        )
+    return OPTIMIZERS[name](
+        learning_rate,
+        SCHEDULES[schedule](**(schedule_options or {})),
+        **(optimizer_options or {}),
+    )
@@ -0,0 +1,87 @@
+from typing import Iterable
+
+import numpy as np
+from numpy import ndarray
+
+
+def standardize_columns(
+    design_matrix: ndarray,
+) -> tuple[ndarray, ndarray]:
+    """Standardizes every column of the design matrix except the bias column (in place).
+    Each feature column ends up with a mean of 0 & a standard deviation of 1.
+    Returns the means & standard deviations that were used, so weights can be mapped back.
+    """
+    features: ndarray = design_matrix[:, 1:]
+    means: ndarray = features.mean(axis=0)
+    features -= means
+    # Standard deviation of every column at once from the centered values
+    scales: ndarray = np.sqrt(np.einsum("ij,ij->j", features, features) / len(features))
+    # Constant columns are only centered (dividing them would divide by zero)
+    scales[scales == 0] = 1
+    features /= scales
+    return means, scales
+
+
+def column_statistics(
+    design_matrices: Iterable[ndarray],
+) -> tuple[ndarray, ndarray]:
+    """Returns the means & standard deviations of every column except the bias column of a design
+    matrix that is only available one chunk of rows at a time (with the same results as standardize_columns).
+    The statistics of every chunk are merged into the running ones (Chan et al.'s pairwise update),
+    which stays accurate even if the columns are far from 0.
+    """
+    count: int = 0
+    means: ndarray = None
+    squared_deviations: ndarray = None
+    for design_matrix in design_matrices:
+        features: ndarray = design_matrix[:, 1:]
+        chunk_count: int = len(features)
+        chunk_means: ndarray = features.mean(axis=0, dtype=np.float64)
+        centered: ndarray = features - chunk_means
+        chunk_squared_deviations: ndarray = np.einsum("ij,ij->j", centered, centered)
+        if means is None:
+            means, squared_deviations = chunk_means, chunk_squared_deviations
+        else:
+            delta: ndarray = chunk_means - means
+            total: int = count + chunk_count
+            means = means + delta * chunk_count / total
+            squared_deviations = (
+                squared_deviations
+                + chunk_squared_deviations
+                + delta**2 * count * chunk_count / total
+            )
+        count += chunk_count
+    if means is None:
+        raise ValueError("Input must have at least one training example.")
+    scales: ndarray = np.sqrt(squared_deviations / count)
+    # Constant columns are only centered (dividing them would divide by zero)
+    scales[scales == 0] = 1
+    return means, scales
+
+
+def apply_standardization(
+    design_matrix: ndarray,
+    means: ndarray,
+    scales: ndarray,
+) -> ndarray:
+    """Standardizes the feature columns of (some rows of) a design matrix with known statistics (in place)."""
+    features: ndarray = design_matrix[:, 1:]
+    features -= means
+    features /= scales
+    return design_matrix
+
+
+def descale_weights(
+    scaled_beta: ndarray,
+    means: ndarray,
+    scales: ndarray,
+) -> ndarray:
+    """Maps weights fitted on a standardized design matrix back to the original units.
+    Since (x - mean) / scale * w = x * (w / scale) - mean * (w / scale), every feature weight is
+    divided by its scale & the bias absorbs the shifted means.
+    Works on a (p)x(k) matrix of weights (one column per target) as well.
+    """
+    beta: ndarray = np.empty_like(scaled_beta)
+    beta[1:] = scaled_beta[1:] / scales.reshape(-1, *[1] * (scaled_beta.ndim - 1))
+    beta[0] = scaled_beta[0] - means @ beta[1:]
+    return beta
@@ -1,39 +1,267 @@
-import csv
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
+import numpy as np
 from numpy import ndarray
 
+from .data_loader import load_dataset
+from .features import PolynomialFeatures, cached_design_matrix
+
+if TYPE_CHECKING:
+    # Matplotlib is slow to import, so it is only imported when something is plotted
+    import matplotlib.pyplot as plt
+
 
 class RegressionModel:
+    input_file_path: str = None  # Path of the dataset file
+    input_layout: str = "variables"  # Layout of the dataset file (if it is a CSV file)
+    feature_spec: PolynomialFeatures = None  # Columns of the design matrix
     parameter_precision: int = 0  # Number of decimal places to round parameters to
-    experimental_data: tuple[list[float], ...] = None  # Data from CSV file
+    experimental_data: ndarray = None  # Data from input file, one row per variable
     n: int = 0  # Number of input variables/features
     m: int = 0  # Number of training examples
+    targets: int = 1  # Number of label rows at the end of the data (k)
     X: ndarray = None  # Design matrix
-    y: ndarray = None  # Labels vector
-    beta: ndarray = None  # Weights vector
+    y: ndarray = None  # Labels vector (or (m)x(k) labels matrix if there are k targets)
+    beta: ndarray = None  # Weights vector (or (p)x(k) weights matrix)
+    metadata: dict = None  # How the model was trained (only set on loaded models)
+    dtype: str = "float64"  # Storage type of the data & design matrix
+    weighted: bool = False  # Whether the last row of the data holds sample weights
+    sample_weights: ndarray = None  # Weight of every training example (if weighted)
 
     def parse_input(
         self,
         input_file_path: str,
-    ) -> tuple[list[float], ...]:
-        """Parses a CSV file & returns a tuple with each entry containing the data as a list."""
-        with open(input_file_path) as csvfile:
-            csv_reader = csv.reader(csvfile)
-            experimental_data: tuple[list[float], ...] = tuple()
-            # "Append" each row (converted to a list of floats) to the tuple
-            for row in csv_reader:
-                experimental_data += ([float(data) for data in row],)
-        if len(experimental_data) < 2:
-            raise ValueError("Input must have at least two lines.")
-        return experimental_data
+        input_layout: str = "variables",
+    ) -> ndarray:
+        """Parses a CSV file (or memory-maps a binary dataset file) & returns an (n+1)x(m) array with one row per variable."""
+        return load_dataset(input_file_path, input_layout, self.dtype)
+
+    def construct_design_matrix(
+        self,
+        features: ndarray = None,
+    ) -> ndarray:
+        """Constructs the design matrix from the input variables of the experimental data (or from the given (n)x(m) inputs).
+        Size of the design matrix: (m)x(p), one column for the bias term & one per term of the feature spec.
+        """
+        if features is None:
+            features = self.experimental_data[: self.n]
+        return self.feature_spec.transform(features, self.dtype)
+
+    def build_design_matrix(self) -> ndarray:
+        """Returns the design matrix of the experimental data when the model is constructed.
+        Models fit on the same data with the same feature spec share one design matrix.
+        """
+        return cached_design_matrix(
+            self.input_file_path,
+            self.input_layout,
+            self.targets,
+            self.feature_spec,
+            self.construct_design_matrix,
+            self.dtype,
+            self.weighted,
+        )
+
+    def select_examples(
+        self,
+        indices: ndarray,
+    ) -> None:
+        """Keeps only the given training examples (e.g. the training folds of a cross-validation)."""
+        self.experimental_data = self.experimental_data[:, indices]
+        self.m = len(indices)
+        if self.sample_weights is not None:
+            self.sample_weights = self.sample_weights[indices]
+        if self.X is not None:
+            self.X = self.X[indices]
+        self.y = self.split_labels(self.experimental_data)
+
+    def split_sample_weights(
+        self,
+        data: ndarray,
+    ) -> tuple[ndarray, ndarray]:
+        """Separates the sample weights (the last row) from the data of a weighted model.
+        Returns the rest of the data (inputs, then labels) & the weights (None if the model is not weighted).
+        """
+        if not self.weighted:
+            return data, None
+        sample_weights: ndarray = np.array(data[-1], dtype=np.float64)
+        if not np.all(np.isfinite(sample_weights)) or np.any(sample_weights < 0):
+            raise ValueError("Sample weights must be finite & not negative.")
+        if not np.sum(sample_weights) > 0:
+            raise ValueError("At least one sample weight must be positive.")
+        return data[:-1], sample_weights
+
+    def split_labels(
+        self,
+        data: ndarray,
+    ) -> ndarray:
+        """Returns the labels of (n+k)x(m) data: a vector for one target, an (m)x(k) matrix otherwise."""
+        if self.targets == 1:
+            return data[-1]
+        return data[-self.targets :].T
+
+    def fit(self) -> "RegressionModel":
+        """Computes the weights vector (without plotting anything) & returns the model."""
+        raise NotImplementedError
+
+    def predict(
+        self,
+        features: ndarray,
+    ) -> ndarray:
+        """Returns the predicted labels for an (n)x(k) array of inputs (one row per input variable)."""
+        if self.beta is None:
+            raise ValueError("The model must be fit before it can make predictions.")
+        return self.construct_design_matrix(np.asarray(features)) @ self.beta
+
+    def score(
+        self,
+        features: ndarray = None,
+        labels: ndarray = None,
+    ) -> float | ndarray:
+        """Returns the coefficient of determination (R²) of the predictions (one per target).
+        Uses the training data unless inputs (one row per input variable) & their labels are given.
+        """
+        if features is None:
+            if self.experimental_data is None:
+                raise ValueError(
+                    "Inputs & labels are required when the data was streamed."
+                )
+            features, labels = self.experimental_data[: self.n], self.y
+        residuals: ndarray = labels - self.predict(features)
+        deviations: ndarray = labels - np.mean(labels, axis=0)
+        # Sums of squares of every target (column) at once
+        return 1 - np.einsum("i...,i...->...", residuals, residuals) / np.einsum(
+            "i...,i...->...", deviations, deviations
+        )
+
+    def rotate_plot(
+        self,
+        ax: "plt.Axes",
+    ) -> None:
+        import matplotlib.pyplot as plt
+
+        angle = 0
+        while True:
+            # Normalize the angle to the range [-180, 180]
+            angle_norm = (angle + 180) % 360 - 180
+            # Update the axis view
+            ax.view_init(elev=20, azim=angle_norm)
+            plt.draw()
+            plt.pause(0.01)
+            angle += 2
+
+    def format_equation(
+        self,
+        beta: ndarray,
+        label: str = "y",
+        subscripts: bool = False,
+    ) -> str:
+        """Returns the regression equation of one target, e.g. "y = 1.0 + 2.0(x_1) + 3.0(x_1)²"
+        (or "y = 1.0 + 2.0x₁ + 3.0x₁²" with subscripts, as plot titles show it).
+        """
+        terms: list[str] = [str(beta[0])] + [
+            f"{beta_i}{name}"
+            for beta_i, name in zip(
+                beta[1:], self.feature_spec.term_names(self.n, subscripts)
+            )
+        ]
+        return f"{label} = " + " + ".join(terms)
+
+    def print_target_equation(
+        self,
+        beta: ndarray,
+        label: str,
+    ) -> None:
+        print(self.format_equation(beta, label))
+
+    def print_regression_equation(self) -> None:
+        """Prints the regression equation of every target."""
+        if self.targets == 1:
+            self.print_target_equation(self.beta, "y")
+        else:
+            for j, beta in enumerate(self.beta.T, start=1):
+                self.print_target_equation(beta, f"y_{j}")
+
+    def plot_univariate(
+        self,
+    ) -> None:
+        import matplotlib.pyplot as plt
+
+        # Plot experimental data
+        plt.scatter(*self.experimental_data, color="red")
+        # Evaluate the regression curve over the range of the data
+        x1 = np.linspace(
+            np.amin(self.experimental_data[0]),
+            np.amax(self.experimental_data[0]),
+        )
+        plt.plot(x1, self.predict(x1[np.newaxis]), color="green")
+        # Add labels & keep plot on screen until user closes it
+        plt.title(self.format_equation(self.beta, subscripts=True), fontsize=15)
+        plt.xlabel("x₁", fontsize=20)
+        plt.ylabel("y", fontsize=20)
+        plt.show(block=True)
+
+    def plot_bivariate(
+        self,
+    ) -> None:
+        import matplotlib.pyplot as plt
+
+        ax = plt.axes(projection="3d")
+        # Plot experimental data
+        ax.scatter(*self.experimental_data, color="red")
+        # Evaluate the regression surface over a grid spanning the data
+        x1 = np.linspace(
+            np.amin(self.experimental_data[0]),
+            np.amax(self.experimental_data[0]),
+        )
+        x2 = np.linspace(
+            np.amin(self.experimental_data[1]),
+            np.amax(self.experimental_data[1]),
+        )
+        x1, x2 = np.meshgrid(x1, x2)
+        y = self.predict(np.stack([x1.ravel(), x2.ravel()])).reshape(x1.shape)
+        ax.plot_surface(x1, x2, y, color="green")
+        # Add labels
+        plt.title(self.format_equation(self.beta, subscripts=True), fontsize=15)
+        ax.set_xlabel("x₁", fontsize=20)
+        ax.set_ylabel("x₂", fontsize=20)
+        ax.set_zlabel("y", fontsize=20)
+        self.rotate_plot(ax)
+
+    def plot_trivariate(
+        self,
+    ) -> None:
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure()
+        ax = plt.axes(projection="3d")
+        # Plot experimental data, colored by its labels
+        scatter_plot = ax.scatter(
+            *self.experimental_data[: self.n],
+            c=self.y,
+            cmap="rainbow",
+        )
+        # Add a legend (colorbar)
+        fig.colorbar(scatter_plot, ax=ax)
+        # Add labels
+        plt.title(self.format_equation(self.beta, subscripts=True), fontsize=15)
+        ax.set_xlabel("x₁", fontsize=20)
+        ax.set_ylabel("x₂", fontsize=20)
+        ax.set_zlabel("x₃", fontsize=20)
+        self.rotate_plot(ax)
 
     def visualize(self) -> None:
-        """Plots the experimental data along with the linear regression curve.
-        If there are 4 or
-        more input variables, the regression equation is printed instead.
+        """Plots the experimental data along with the regression curve of the fitted model.
+        If there are 4 or more input variables, several targets (or the data was streamed),
+        the regression equations are printed instead.
         """
+        if self.beta is None:
+            raise ValueError("The model must be fit before it can be visualized.")
+        import matplotlib.pyplot as plt
+
         plt.ion()
-        if self.n == 1:
+        if self.experimental_data is None or self.targets > 1:
+            self.print_regression_equation()
+        elif self.n == 1:
             self.plot_univariate()
         elif self.n == 2:
             self.plot_bivariate()
@@ -45,9 +273,23 @@ class RegressionModel:
     def __init__(
         self,
         input_file_path: str,
+        input_layout: str = "variables",
+        targets: int = 1,
     ) -> None:
-        self.experimental_data = self.parse_input(input_file_path)
-        self.n = len(self.experimental_data) - 1  # Minus one to account for the labels
+        if self.feature_spec is None:
+            raise ValueError("A feature spec is required to build the design matrix.")
+        self.input_file_path = input_file_path
+        self.input_layout = input_layout
+        self.targets = targets
+        self.experimental_data, self.sample_weights = self.split_sample_weights(
+            self.parse_input(input_file_path, input_layout)
+        )
+        # Minus the label rows
+        self.n = len(self.experimental_data) - targets
+        if targets < 1 or self.n < 1:
+            raise ValueError(
+                "'targets' must be a positive integer smaller than the number of variables."
+            )
         self.m = len(self.experimental_data[0])
-        self.X = self.construct_design_matrix()
-        self.y = self.experimental_data[-1]
+        self.X = self.build_design_matrix()
+        self.y = self.split_labels(self.experimental_data)
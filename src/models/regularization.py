@@ -0,0 +1,206 @@
+from math import copysign, sqrt
+
+import numpy as np
+from numpy import ndarray
+
+# Smallest share of L1 penalty used to find where a penalty path starts (as in glmnet), since
+# no finite L2 penalty makes the weights exactly 0
+MIN_L1_RATIO: float = 1e-3
+# Penalties solve_regularized warm starts coordinate descent with, before the requested one
+WARM_START_STEPS: int = 10
+
+
+def center_statistics(
+    XTX: ndarray,
+    XTy: ndarray,
+) -> tuple[ndarray, ndarray, ndarray, ndarray]:
+    """Centers the feature columns of XTX & XTy, so the bias can be left out of the penalty.
+    The first column of X is the bias column (all ones), so XTX[0, 0] is m & the first row of XTX
+    holds the column sums. Returns the centered (p-1)x(p-1) XTX & (p-1)x(k) XTy, along with the
+    column means & the label means (which give back the bias once the other weights are known).
+    """
+    m: float = XTX[0, 0]
+    means: ndarray = XTX[0, 1:] / m
+    label_means: ndarray = np.reshape(XTy[0], -1) / m
+    centered_XTX: ndarray = XTX[1:, 1:] - m * np.outer(means, means)
+    centered_XTy: ndarray = XTy[1:].reshape(len(means), -1) - m * np.outer(
+        means, label_means
+    )
+    return centered_XTX, centered_XTy, means, label_means
+
+
+def add_bias(
+    weights: ndarray,
+    means: ndarray,
+    label_means: ndarray,
+    target_shape: tuple[int, ...],
+) -> ndarray:
+    """Turns (L)x(p-1)x(k) weights fitted on centered columns into (L)x(p)[x(k)] weights with a bias."""
+    bias: ndarray = label_means - np.einsum("ljk,j->lk", weights, means)
+    return np.concatenate([bias[:, np.newaxis], weights], axis=1).reshape(
+        len(weights), len(means) + 1, *target_shape
+    )
+
+
+def ridge_path(
+    XTX: ndarray,
+    XTy: ndarray,
+    penalties: list[float],
+) -> ndarray:
+    """Returns the (L)x(p)[x(k)] ridge weights for every penalty λ, minimizing
+    (1/2m)·||y - X @ beta||² + (λ/2)·||w||², where w are all weights but the bias.
+    The centered XTX = V @ diag(s) @ V.T is decomposed once, after which the weights of any penalty
+    are V @ ((V.T @ XTy) / (s + m·λ)), so a whole path costs about as much as a single solve.
+    Penalties must be positive, since a singular XTX has eigenvalues of 0 that only λ keeps from
+    being divided by.
+    """
+    if np.amin(penalties) <= 0:
+        raise ValueError("Penalties must be positive.")
+    centered_XTX, centered_XTy, means, label_means = center_statistics(XTX, XTy)
+    eigenvalues, eigenvectors = np.linalg.eigh(centered_XTX)
+    # Rounding errors can make the eigenvalues of a singular XTX slightly negative
+    eigenvalues = np.maximum(eigenvalues, 0)
+    projected: ndarray = eigenvectors.T @ centered_XTy
+    # (L)x(p-1) factors every eigenvector is shrunk by for every penalty
+    shrinkage: ndarray = 1 / (
+        eigenvalues + XTX[0, 0] * np.asarray(penalties, dtype=float)[:, np.newaxis]
+    )
+    weights: ndarray = eigenvectors @ (shrinkage[..., np.newaxis] * projected)
+    return add_bias(weights, means, label_means, XTy.shape[1:])
+
+
+def penalty_path(
+    XTX: ndarray,
+    XTy: ndarray,
+    l1_ratio: float = 1.0,
+    count: int = 100,
+    min_ratio: float = 1e-3,
+) -> ndarray:
+    """Returns `count` penalties from the smallest one that makes every weight but the bias 0 down to
+    min_ratio times that penalty, evenly spaced on a log scale (the order elastic_net_path works best in).
+    """
+    _, centered_XTy, _, _ = center_statistics(XTX, XTy)
+    largest: float = np.amax(np.abs(centered_XTy)) / (
+        XTX[0, 0] * max(l1_ratio, MIN_L1_RATIO)
+    )
+    return np.geomspace(largest, largest * min_ratio, count)
+
+
+def coordinate_descent(
+    XTX: ndarray,
+    gradient: ndarray,
+    weights: ndarray,
+    indices: ndarray,
+    l1: float,
+    l2: float,
+    tolerance: float,
+    max_sweeps: int,
+) -> None:
+    """Minimizes the elastic net objective over the weights at the given indices (in place).
+    gradient holds XTy - XTX @ weights & is updated along with every weight, which costs O(p).
+    After a sweep over every index, only the nonzero weights are swept until they settle, then
+    every index is swept again to confirm the weights converged. Changes are measured in units of
+    the spread of their columns (√XTX[j, j]), so the features' scales do not matter.
+    """
+    # Python floats, since every update only reads a few scalars
+    diagonal: list[float] = np.diag(XTX).tolist()
+    spreads: ndarray = np.sqrt(np.diag(XTX))
+    active: ndarray = indices
+    for _ in range(max_sweeps):
+        largest_change: float = 0.0
+        for j in active.tolist():
+            old: float = float(weights[j])
+            z: float = float(gradient[j]) + diagonal[j] * old
+            # Soft thresholding by the L1 penalty, shrinking by the L2 penalty
+            new: float = copysign(max(abs(z) - l1, 0.0) / (diagonal[j] + l2), z)
+            if new != old:
+                gradient -= (new - old) * XTX[j]
+                weights[j] = new
+                largest_change = max(largest_change, abs(new - old) * sqrt(diagonal[j]))
+        converged: bool = largest_change <= tolerance * np.amax(
+            np.abs(weights) * spreads
+        )
+        if converged and active is indices:
+            return
+        if converged:
+            active = indices
+        elif active is indices:
+            active = indices[weights[indices] != 0]
+
+
+def elastic_net_path(
+    XTX: ndarray,
+    XTy: ndarray,
+    penalties: list[float],
+    l1_ratio: float = 1.0,
+    tolerance: float = 1e-8,
+    max_sweeps: int = 10_000,
+) -> ndarray:
+    """Returns the (L)x(p)[x(k)] elastic net weights for every penalty λ, minimizing
+    (1/2m)·||y - X @ beta||² + λ·(l1_ratio·||w||₁ + (1 - l1_ratio)/2·||w||²), where w are all weights
+    but the bias (l1_ratio = 1 is the lasso).
+    Coordinate descent runs on the centered XTX, so an update costs O(p) no matter how many training
+    examples there are. Every penalty starts from the weights of the previous one (a warm start) & the
+    sequential strong rule screens out the weights that will most likely stay 0. Screened weights are
+    added back if they violate the optimality (KKT) conditions once the others converged.
+    """
+    if np.amin(penalties) < 0:
+        raise ValueError("Penalties must not be negative.")
+    centered_XTX, centered_XTy, means, label_means = center_statistics(XTX, XTy)
+    m: float = XTX[0, 0]
+    # Constant columns do not change the fit, so their weights stay 0
+    usable: ndarray = np.diag(centered_XTX) > 0
+    path: ndarray = np.zeros((len(penalties), *centered_XTy.shape))
+    for target in range(centered_XTy.shape[1]):
+        weights: ndarray = np.zeros(len(means))
+        gradient: ndarray = centered_XTy[:, target].copy()
+        # Smallest L1 penalty (times m) at which every weight is 0
+        previous_l1: float = np.amax(np.abs(gradient))
+        for index, penalty in enumerate(penalties):
+            l1: float = m * penalty * l1_ratio
+            l2: float = m * penalty * (1 - l1_ratio)
+            # Strong rule: a weight that is 0 stays 0 if |gradient| < 2·l1 - (previous l1)
+            candidates: ndarray = usable & (
+                (weights != 0) | (np.abs(gradient) >= 2 * l1 - previous_l1)
+            )
+            while True:
+                coordinate_descent(
+                    centered_XTX,
+                    gradient,
+                    weights,
+                    np.flatnonzero(candidates),
+                    l1,
+                    l2,
+                    tolerance,
+                    max_sweeps,
+                )
+                # A weight of 0 is only optimal if |gradient| <= l1
+                violations: ndarray = usable & ~candidates & (np.abs(gradient) > l1)
+                if not violations.any():
+                    break
+                candidates |= violations
+            path[index, :, target] = weights
+            previous_l1 = l1
+    return add_bias(path, means, label_means, XTy.shape[1:])
+
+
+def solve_regularized(
+    XTX: ndarray,
+    XTy: ndarray,
+    regularization: float,
+    l1_ratio: float = 0.0,
+) -> tuple[ndarray, str]:
+    """Solves the penalized normal equation for a single penalty (see ridge_path & elastic_net_path).
+    Returns beta along with the name of the solver that was used.
+    """
+    if l1_ratio == 0:
+        return ridge_path(XTX, XTy, [regularization])[0], "ridge"
+    # Coordinate descent is warm started from the penalty where every weight is still 0
+    largest: float = penalty_path(XTX, XTy, l1_ratio, 1)[0]
+    penalties: ndarray = np.array([regularization])
+    if regularization < largest:
+        penalties = np.geomspace(largest, regularization, WARM_START_STEPS)
+    return (
+        elastic_net_path(XTX, XTy, penalties, l1_ratio)[-1],
+        "coordinate_descent",
+    )
@@ -0,0 +1,38 @@
+import numpy as np
+from numpy import ndarray
+
+# Losses the normal equation models can minimize:
+#   "squared": least squares (the usual normal equation)
+#   "huber": squared for small residuals & linear for large ones, so outliers pull less on the fit
+LOSSES: tuple[str, ...] = ("squared", "huber")
+# Median absolute deviation of a standard normal distribution, which turns the MAD into an
+# estimate of the standard deviation
+MAD_CONSISTENCY: float = 0.6745
+# Robust scales at most this share of the largest label are treated as 0, since they only hold the
+# rounding errors of training examples that are fit exactly
+ZERO_SCALE: float = 1e-10
+
+
+def robust_scale(
+    residuals: ndarray,
+) -> float:
+    """Estimates the standard deviation of residuals from their median absolute deviation (MAD),
+    which (unlike the standard deviation) a few huge outliers barely change.
+    """
+    return float(np.median(np.abs(residuals - np.median(residuals))) / MAD_CONSISTENCY)
+
+
+def huber_weights(
+    residuals: ndarray,
+    delta: float = 1.345,
+) -> ndarray:
+    """Returns the weight of every residual r in the Huber loss: 1 while |r| <= delta·s & delta·s / |r|
+    beyond that, where s is the robust scale of the residuals. The default delta keeps 95% of the
+    efficiency of least squares when the residuals are normally distributed.
+    """
+    absolute: ndarray = np.abs(residuals)
+    threshold: float = delta * robust_scale(residuals)
+    weights: ndarray = np.ones(len(residuals))
+    outliers: ndarray = absolute > threshold
+    weights[outliers] = threshold / absolute[outliers]
+    return weights
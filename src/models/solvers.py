@@ -0,0 +1,153 @@
+import numpy as np
+from numpy import ndarray
+
+SOLVERS: tuple[str, ...] = ("auto", "cholesky", "qr", "lstsq", "pinv")
+# Largest condition number of XTX (estimated from its Cholesky factor) that "auto" accepts
+# before switching to a QR factorization of X, roughly the square root of 1 / machine epsilon
+MAX_GRAM_CONDITION: float = 1e8
+
+
+def gram_condition(
+    L: ndarray,
+) -> float:
+    """Estimates the condition number of XTX = L @ L.T from the diagonal of its Cholesky factor.
+    (max(diag(L)) / min(diag(L)))² never exceeds cond(XTX) & costs O(p) instead of an SVD.
+    """
+    diagonal: ndarray = np.abs(np.diag(L))
+    return float((np.amax(diagonal) / np.amin(diagonal)) ** 2)
+
+
+def solve_cholesky(
+    L: ndarray,
+    XTy: ndarray,
+) -> ndarray:
+    """Solves XTX @ beta = XTy given the Cholesky factor L of XTX = L @ L.T.
+    Forward substitution (L @ z = XTy) is followed by back substitution (L.T @ beta = z), each
+    solving one row at a time in O(p²) in total (XTy may hold k targets as a (p)x(k) matrix).
+    """
+    p: int = len(L)
+    z: ndarray = np.empty(XTy.shape, dtype=np.result_type(L, XTy))
+    for i in range(p):
+        z[i] = (XTy[i] - L[i, :i] @ z[:i]) / L[i, i]
+    beta: ndarray = np.empty_like(z)
+    for i in reversed(range(p)):
+        beta[i] = (z[i] - L[i + 1 :, i] @ beta[i + 1 :]) / L[i, i]
+    return beta
+
+
+def try_cholesky(
+    XTX: ndarray,
+    XTy: ndarray,
+) -> ndarray | None:
+    """Solves XTX @ beta = XTy with a Cholesky factorization if XTX is well-conditioned enough for it
+    (see MAX_GRAM_CONDITION). Returns None otherwise, so the caller can factor the rows of X instead.
+    """
+    try:
+        L: ndarray = np.linalg.cholesky(XTX)
+    except np.linalg.LinAlgError:
+        return None
+    if gram_condition(L) >= MAX_GRAM_CONDITION:
+        return None
+    return solve_cholesky(L, XTy)
+
+
+def solve_qr(
+    X: ndarray,
+    y: ndarray,
+) -> ndarray:
+    """Solves the least squares problem directly on X using the QR factorization X = Q @ R.
+    This avoids forming XTX, which squares the condition number of X.
+    Raises a LinAlgError if X does not have full column rank.
+    """
+    Q, R = np.linalg.qr(X)
+    diagonal: ndarray = np.abs(np.diag(R))
+    if np.amin(diagonal) <= np.amax(diagonal) * max(X.shape) * np.finfo(R.dtype).eps:
+        raise np.linalg.LinAlgError("X does not have full column rank.")
+    return np.linalg.solve(R, Q.T @ y)
+
+
+def solve_lstsq(
+    X: ndarray,
+    y: ndarray,
+) -> ndarray:
+    """Solves the least squares problem directly on X using an SVD (handles rank-deficient X)."""
+    return np.linalg.lstsq(X, y, rcond=None)[0]
+
+
+def solve_pinv(
+    XTX: ndarray,
+    XTy: ndarray,
+) -> ndarray:
+    """Multiplies the Moore-Penrose pseudoinverse of XTX by XTy."""
+    return np.linalg.pinv(XTX) @ XTy
+
+
+def solve_gram(
+    XTX: ndarray,
+    XTy: ndarray,
+    solver: str = "auto",
+) -> tuple[ndarray, str]:
+    """Solves the normal equation when only XTX & XTy are available.
+    Returns beta along with the name of the solver that was actually used.
+    """
+    if solver in ("qr", "lstsq"):
+        raise ValueError(f"The '{solver}' solver needs the full design matrix.")
+    if solver not in SOLVERS:
+        raise ValueError(f"'solver' must be one of {SOLVERS}, got '{solver}'.")
+    if solver == "pinv":
+        return solve_pinv(XTX, XTy), "pinv"
+    try:
+        return solve_cholesky(np.linalg.cholesky(XTX), XTy), "cholesky"
+    except np.linalg.LinAlgError:
+        # XTX is singular (or numerically indefinite), fall back to the pseudoinverse
+        return solve_pinv(XTX, XTy), "pinv"
+
+
+def scale_rows(
+    X: ndarray,
+    y: ndarray,
+    sample_weights: ndarray = None,
+) -> tuple[ndarray, ndarray]:
+    """Scales every row of X & y by the square root of its sample weight, which turns weighted least
+    squares (minimizing Σ wᵢ·rᵢ²) into ordinary least squares that any solver can factor.
+    Returns X & y unchanged if there are no sample weights.
+    """
+    if sample_weights is None:
+        return X, y
+    roots: ndarray = np.sqrt(sample_weights)
+    return X * roots[:, np.newaxis], y * roots.reshape(-1, *[1] * (y.ndim - 1))
+
+
+def solve_least_squares(
+    X: ndarray,
+    y: ndarray,
+    solver: str = "auto",
+) -> tuple[ndarray, str]:
+    """Finds the beta that minimizes ||y - X @ beta|| with the requested solver.
+    y may also be an (m)x(k) matrix of targets, then every column is solved with one factorization.
+    "auto" uses a Cholesky factorization of XTX when it is well-conditioned & QR (or an SVD) on X otherwise.
+    Returns beta along with the name of the solver that was actually used.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"'solver' must be one of {SOLVERS}, got '{solver}'.")
+    if solver == "lstsq":
+        return solve_lstsq(X, y), "lstsq"
+    if solver == "qr":
+        try:
+            return solve_qr(X, y), "qr"
+        except np.linalg.LinAlgError:
+            return solve_lstsq(X, y), "lstsq"
+    XTX: ndarray = X.T @ X
+    XTy: ndarray = X.T @ y
+    if solver != "auto":
+        return solve_gram(XTX, XTy, solver)
+    # Only use the normal equation when there are more examples than weights
+    if X.shape[0] > X.shape[1]:
+        beta: ndarray = try_cholesky(XTX, XTy)
+        if beta is not None:
+            return beta, "cholesky"
+    # XTX is ill-conditioned, so factor X itself instead
+    try:
+        return solve_qr(X, y), "qr"
+    except np.linalg.LinAlgError:
+        return solve_lstsq(X, y), "lstsq"
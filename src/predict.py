@@ -0,0 +1,42 @@
+import argparse
+
+from models.artifacts import load_model, predict_file
+from models.data_loader import LAYOUTS
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Predicts the labels of a dataset file with a saved model.",
+    )
+    parser.add_argument("model_file_path", help="Model artifact (.npz) to predict with")
+    parser.add_argument(
+        "input_file_path",
+        help="CSV or binary dataset file holding the input variables (labels are ignored)",
+    )
+    parser.add_argument(
+        "--output",
+        default="predictions.csv",
+        help="CSV file to write the predictions to (one line per training example)",
+    )
+    parser.add_argument("--layout", choices=LAYOUTS, default="variables")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Number of training examples predicted at a time",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    model = load_model(args.model_file_path)
+    count: int = predict_file(
+        model, args.input_file_path, args.output, args.chunk_size, args.layout
+    )
+    print(f"{count} predictions -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
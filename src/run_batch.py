@@ -0,0 +1,242 @@
+"""Fits many configurations concurrently, one configuration per worker process.
+Configurations come from JSON files (each holding one configuration or a list of them) and/or from
+glob patterns over dataset files, which are combined with the keys of a base configuration.
+CSV datasets are parsed once & shared with every worker through shared memory instead of being
+pickled, binary datasets are memory-mapped by each worker (so the OS shares their pages).
+Run it from the src directory: python3 run_batch.py --glob "data/normal/**/*.csv" --workers 4
+"""
+
+import argparse
+from glob import glob
+import json
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import os
+from time import perf_counter
+
+import numpy as np
+from numpy import ndarray
+
+from main import build_model, parse_config
+from models.data_loader import BINARY_EXTENSION, PRELOADED_DATASETS, load_csv
+
+# Shared memory blocks a worker has attached to (kept alive for as long as the worker runs)
+ATTACHED_BLOCKS: list[SharedMemory] = []
+
+
+def expand_configurations(
+    config_file_paths: list[str],
+    patterns: list[str],
+    base_config: dict,
+    regression_methods: list[str],
+    regression_types: list[str],
+) -> list[dict]:
+    """Returns every configuration to fit.
+    Each file matching a pattern is fit with every regression method & type, all other keys
+    come from the base configuration.
+    """
+    configurations: list[dict] = []
+    for config_file_path in config_file_paths:
+        config: dict | list[dict] = parse_config(config_file_path)
+        configurations.extend(config if isinstance(config, list) else [config])
+    for pattern in patterns:
+        for input_file_path in sorted(glob(pattern, recursive=True)):
+            for regression_method in regression_methods:
+                for regression_type in regression_types:
+                    configurations.append(
+                        {
+                            **base_config,
+                            "regression_method": regression_method,
+                            "regression_type": regression_type,
+                            "input_file_path": input_file_path,
+                        }
+                    )
+    return configurations
+
+
+def storage_dtype(
+    config: dict,
+) -> str:
+    """Returns the dtype the model of a configuration reads its data in (see build_model)."""
+    if config.get("regression_method") == "normal":
+        return "float64"
+    return config.get("dtype", "float64")
+
+
+def share_datasets(
+    configurations: list[dict],
+) -> tuple[
+    dict[tuple[str, str, str], tuple[str, tuple[int, int]]],
+    list[SharedMemory],
+]:
+    """Parses every CSV dataset once (in every dtype it is needed in) & copies it into its own shared
+    memory block. Returns how workers can find each dataset (block name & shape) along with the blocks.
+    Datasets that fail to load are not shared, so every configuration using one reports the error
+    from its own fit instead of stopping the whole batch.
+    """
+    descriptors: dict[tuple[str, str, str], tuple[str, tuple[int, int]]] = {}
+    blocks: list[SharedMemory] = []
+    failed: set[tuple[str, str, str]] = set()
+    for config in configurations:
+        key: tuple[str, str, str] = (
+            config.get("input_file_path"),
+            config.get("input_layout", "variables"),
+            storage_dtype(config),
+        )
+        if (
+            key[0] is None
+            or key in descriptors
+            or key in failed
+            or key[0].endswith(BINARY_EXTENSION)
+        ):
+            continue
+        try:
+            data: ndarray = load_csv(key[0], key[1], dtype=key[2])
+        except (OSError, ValueError):
+            failed.add(key)
+            continue
+        block = SharedMemory(create=True, size=max(data.nbytes, 1))
+        # Copying also makes "samples" datasets contiguous (one variable after another)
+        np.ndarray(data.shape, dtype=key[2], buffer=block.buf)[:] = data
+        descriptors[key] = (block.name, data.shape)
+        blocks.append(block)
+    return descriptors, blocks
+
+
+def attach_datasets(
+    descriptors: dict[tuple[str, str, str], tuple[str, tuple[int, int]]],
+) -> None:
+    """Maps the shared datasets into a worker process (runs once per worker)."""
+    for key, (block_name, shape) in descriptors.items():
+        block = SharedMemory(name=block_name)
+        data: ndarray = np.ndarray(shape, dtype=key[2], buffer=block.buf)
+        # Models must never write to a dataset other workers are reading
+        data.flags.writeable = False
+        PRELOADED_DATASETS[key] = data
+        ATTACHED_BLOCKS.append(block)
+
+
+def fit_configuration(
+    config: dict,
+) -> dict:
+    """Fits one configuration & returns a summary of the result (or of the error)."""
+    result: dict = {
+        "regression_method": config["regression_method"],
+        "regression_type": config["regression_type"],
+        "input_file_path": config["input_file_path"],
+    }
+    start_time: float = perf_counter()
+    try:
+        model = build_model(config)
+        model.fit()
+    except Exception as error:
+        return {
+            **result,
+            "status": "error",
+            "error": f"{type(error).__name__}: {error}",
+        }
+    return {
+        **result,
+        "status": "ok",
+        "seconds": round(perf_counter() - start_time, 6),
+        "iterations": getattr(model, "iterations", None),
+        "beta": model.beta.tolist(),
+        # Streamed models do not keep their training data around to score it
+        "r_squared": (
+            np.round(model.score(), 6).tolist()
+            if model.experimental_data is not None
+            else None
+        ),
+    }
+
+
+def print_summary(
+    results: list[dict],
+) -> None:
+    """Prints one line per configuration."""
+    for result in results:
+        name: str = (
+            f"{result['regression_method']:<9} {result['regression_type']:<9} "
+            f"{result['input_file_path']}"
+        )
+        if result["status"] == "ok":
+            print(
+                f"{name}: R² = {result['r_squared']}, "
+                f"{result['seconds']:.4f} s, {result['iterations']} iterations"
+            )
+        else:
+            print(f"{name}: {result['error']}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "config_file_paths",
+        nargs="*",
+        help="JSON files holding a configuration or a list of configurations",
+    )
+    parser.add_argument(
+        "--glob",
+        dest="patterns",
+        action="append",
+        default=[],
+        help="Fits every dataset file matching this pattern (e.g. 'data/**/*.csv')",
+    )
+    parser.add_argument(
+        "--base-config",
+        default="config.json",
+        help="Configuration whose keys are used for datasets found with --glob",
+    )
+    parser.add_argument("--regression-methods", nargs="+")
+    parser.add_argument("--regression-types", nargs="+")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (defaults to the number of CPU cores)",
+    )
+    parser.add_argument("--output", help="Writes the JSON summary to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.config_file_paths and not args.patterns:
+        args.patterns = ["data/**/*.csv"]
+    base_config: dict = parse_config(args.base_config) if args.patterns else {}
+    configurations: list[dict] = expand_configurations(
+        args.config_file_paths,
+        args.patterns,
+        base_config,
+        args.regression_methods or [base_config.get("regression_method")],
+        args.regression_types or [base_config.get("regression_type")],
+    )
+    if args.workers < 1:
+        raise ValueError("'workers' must be a positive integer.")
+
+    descriptors, blocks = share_datasets(configurations)
+    start_time: float = perf_counter()
+    try:
+        with Pool(args.workers, attach_datasets, (descriptors,)) as pool:
+            results: list[dict] = pool.map(fit_configuration, configurations, 1)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    print_summary(results)
+    summary: dict = {
+        "workers": args.workers,
+        "seconds": round(perf_counter() - start_time, 6),
+        "fitted": sum(result["status"] == "ok" for result in results),
+        "failed": sum(result["status"] == "error" for result in results),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(summary, output_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
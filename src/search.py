@@ -0,0 +1,152 @@
+"""Tunes a model configuration with k-fold cross-validation over a grid or random search space.
+Every candidate overrides some keys of a base configuration (e.g. regression_type, learning_rate or
+parameter_precision), is cross-validated in a worker process & the candidates are printed best first.
+Datasets are parsed once & shared with every worker (see run_batch.py).
+Run it from the src directory:
+python3 search.py --space '{"regression_type": ["linear", "quadratic"], "learning_rate": [0.01, 0.1, 0.5]}'
+"""
+
+import argparse
+import json
+from multiprocessing import Pool
+import os
+from time import perf_counter
+
+from main import build_model, parse_config
+from models.model_selection import (
+    cross_validate,
+    grid_candidates,
+    random_candidates,
+    rank_results,
+)
+from run_batch import attach_datasets, share_datasets
+
+
+def evaluate_candidate(
+    task: tuple[dict, dict, int, int],
+) -> dict:
+    """Cross-validates one candidate & returns its scores (or its error)."""
+    base_config, candidate, folds, seed = task
+    result: dict = {"candidate": candidate}
+    try:
+        model = build_model({**base_config, **candidate})
+        return {**result, "status": "ok", **cross_validate(model, folds, seed)}
+    except Exception as error:
+        return {
+            **result,
+            "status": "error",
+            "error": f"{type(error).__name__}: {error}",
+        }
+
+
+def print_table(
+    results: list[dict],
+) -> None:
+    """Prints the ranked candidates, one per line."""
+    print(
+        f"{'rank':>4}  {'mean R²':>9}  {'std R²':>8}  {'mean MSE':>12}  {'seconds':>8}  candidate"
+    )
+    for result in results:
+        candidate: str = json.dumps(result["candidate"])
+        if result["status"] == "ok":
+            print(
+                f"{result['rank']:>4}  {result['mean_r_squared']:>9.6f}  "
+                f"{result['std_r_squared']:>8.6f}  {result['mean_mse']:>12.6g}  "
+                f"{result['seconds']:>8.4f}  {candidate}"
+            )
+        else:
+            print(f"{'-':>4}  {result['error']}  {candidate}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Returns the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--base-config",
+        default="config.json",
+        help="Configuration every candidate starts from",
+    )
+    parser.add_argument(
+        "--space",
+        required=True,
+        help="Search space as JSON (or a JSON file): every key maps to a list of values to try",
+    )
+    parser.add_argument(
+        "--random",
+        type=int,
+        metavar="COUNT",
+        help="Samples this many random candidates instead of trying the whole grid "
+        "(keys may also map to {'uniform' | 'log_uniform' | 'integer': [low, high]})",
+    )
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the folds & of random candidates"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (defaults to the number of CPU cores)",
+    )
+    parser.add_argument(
+        "--output", help="Writes the ranked results as JSON to this file"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.workers < 1:
+        raise ValueError("'workers' must be a positive integer.")
+    base_config: dict = parse_config(args.base_config)
+    space: dict = (
+        parse_config(args.space)
+        if os.path.isfile(args.space)
+        else json.loads(args.space)
+    )
+    candidates: list[dict] = (
+        grid_candidates(space)
+        if args.random is None
+        else random_candidates(space, args.random, args.seed)
+    )
+
+    configurations: list[dict] = [
+        {**base_config, **candidate} for candidate in candidates
+    ]
+    descriptors, blocks = share_datasets(configurations)
+    start_time: float = perf_counter()
+    try:
+        with Pool(args.workers, attach_datasets, (descriptors,)) as pool:
+            results: list[dict] = pool.map(
+                evaluate_candidate,
+                [
+                    (base_config, candidate, args.folds, args.seed)
+                    for candidate in candidates
+                ],
+                1,
+            )
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    results = rank_results(results)
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {
+                    "base_config": base_config,
+                    "folds": args.folds,
+                    "seed": args.seed,
+                    "workers": args.workers,
+                    "seconds": round(perf_counter() - start_time, 6),
+                    "results": results,
+                },
+                output_file,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    main()